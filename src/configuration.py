@@ -7,9 +7,10 @@ sensible defaults for the EC2 auto-shutdown Lambda function.
 
 import os
 from dataclasses import dataclass
+from typing import Tuple
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Configuration:
     """
     Configuration for EC2 Auto-Shutdown Lambda function.
@@ -18,14 +19,20 @@ class Configuration:
         tag_key: EC2 tag key to filter instances (default: "AutoShutdown")
         tag_value: EC2 tag value to filter instances (default: "yes")
         region: AWS region for EC2 operations (required)
+        regions: AWS regions to shut instances down in (default: (region,))
         max_retries: Maximum number of retry attempts for API calls (default: 3)
         retry_base_delay: Base delay in seconds for exponential backoff (default: 1.0)
+        retry_max_delay: Maximum delay in seconds for a single retry (default: 20.0)
+        log_level: Minimum log level to emit (default: "INFO")
     """
     tag_key: str
     tag_value: str
     region: str
+    regions: Tuple[str, ...]
     max_retries: int
     retry_base_delay: float
+    retry_max_delay: float
+    log_level: str
     
     @staticmethod
     def load() -> 'Configuration':
@@ -36,30 +43,47 @@ class Configuration:
             TAG_KEY: Custom tag key (default: "AutoShutdown")
             TAG_VALUE: Custom tag value (default: "yes")
             AWS_REGION: AWS region (required, no default)
+            REGIONS: Comma-separated AWS regions to process (default: AWS_REGION)
             MAX_RETRIES: Maximum retry attempts (default: "3")
             RETRY_BASE_DELAY: Base delay for retries in seconds (default: "1.0")
+            RETRY_MAX_DELAY: Maximum delay for a single retry in seconds (default: "20.0")
+            LOG_LEVEL: Minimum log level: INFO, WARNING or ERROR (default: "INFO")
         
         Returns:
             Configuration instance with loaded values
             
         Raises:
-            ValueError: If region is empty or not set
+            ValueError: If region is empty or not set, or LOG_LEVEL is not a
+                supported level
         """
         # Load configuration from environment variables with defaults
         tag_key = os.environ.get('TAG_KEY', 'AutoShutdown')
         tag_value = os.environ.get('TAG_VALUE', 'yes')
         region = os.environ.get('AWS_REGION', '')
+        regions = tuple(
+            name.strip()
+            for name in os.environ.get('REGIONS', '').split(',')
+            if name.strip()
+        )
         max_retries = int(os.environ.get('MAX_RETRIES', '3'))
         retry_base_delay = float(os.environ.get('RETRY_BASE_DELAY', '1.0'))
+        retry_max_delay = float(os.environ.get('RETRY_MAX_DELAY', '20.0'))
+        log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
         
         # Validate required fields
         if not region:
             raise ValueError("AWS_REGION environment variable must be set and not empty")
         
+        if log_level not in ('INFO', 'WARNING', 'ERROR'):
+            raise ValueError("LOG_LEVEL environment variable must be one of INFO, WARNING, ERROR")
+        
         return Configuration(
             tag_key=tag_key,
             tag_value=tag_value,
             region=region,
+            regions=regions or (region,),
             max_retries=max_retries,
-            retry_base_delay=retry_base_delay
+            retry_base_delay=retry_base_delay,
+            retry_max_delay=retry_max_delay,
+            log_level=log_level
         )
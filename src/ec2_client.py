@@ -5,26 +5,365 @@ This module provides a resilient interface to EC2 API with retry logic
 and pagination support for instance discovery and management.
 """
 
+import operator
+import random
+import re
+import signal
+import threading
 import time
-from typing import List, Dict, Any, Callable, TypeVar
-from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterator, Optional, Sequence, Set, Tuple, TypeVar
+from functools import lru_cache, wraps
+from itertools import chain
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from botocore.paginate import TokenEncoder
+from src.rate_limiter import TokenBucket
 
 T = TypeVar('T')
 
+# StopInstances accepts at most 1000 instance IDs per request
+MAX_STOP_BATCH_SIZE = 1000
 
-def retry_with_exponential_backoff(max_retries: int, base_delay: float) -> Callable:
+# DescribeInstances returns at most 1000 instances per page (MaxResults);
+# without an explicit page size each page holds far fewer, costing extra
+# round trips on large fleets
+DESCRIBE_PAGE_SIZE = 1000
+
+# Upper bound on concurrent API calls, also used to size the HTTPS connection pool
+MAX_CONCURRENT_REQUESTS = 32
+
+# Client-side pacing per region, matching EC2's default request token buckets:
+# non-mutating (Describe*) actions refill at 20/s with a burst of 100, and
+# mutating actions such as StopInstances refill at 5/s with a burst of 200
+DESCRIBE_RATE_LIMIT = 20.0
+DESCRIBE_BURST = 100.0
+STOP_RATE_LIMIT = 5.0
+STOP_BURST = 200.0
+
+# Seconds a completed describe result is reused for an identical query, and
+# the maximum number of cached queries
+DESCRIBE_CACHE_TTL = 30.0
+DESCRIBE_CACHE_MAX_ENTRIES = 64
+
+# Error codes AWS uses to signal request throttling or a transient service
+# failure; requests failing with these are retried
+_RETRYABLE_ERROR_CODES = frozenset({
+    'RequestLimitExceeded',
+    'Throttling',
+    'ThrottlingException',
+    'RequestThrottled',
+    'TooManyRequestsException',
+    'ProvisionedThroughputExceededException',
+    'ServiceUnavailable',
+    'RequestTimeout',
+})
+
+# StopInstances error codes meaning the instance no longer needs stopping
+# (already stopped or gone); these are not counted as failures
+_IGNORABLE_STOP_ERROR_CODES = frozenset({
+    'IncorrectInstanceState',
+    'InvalidInstanceID.NotFound',
+})
+
+# StopInstances error codes caused by particular instances in the request;
+# if EC2 does not name the instances, each one is stopped separately to find
+# them
+_INSTANCE_STOP_ERROR_CODES = frozenset({
+    'IncorrectInstanceState',
+    'InvalidInstanceID.Malformed',
+    'InvalidInstanceID.NotFound',
+})
+
+# Error codes that apply to a whole request regardless of the instances in it
+# (authorization, credentials, account or region access); together with the
+# retryable codes, these fail every instance in the request
+_REQUEST_WIDE_ERROR_CODES = frozenset({
+    'AuthFailure',
+    'Blocked',
+    'InternalError',
+    'InvalidClientTokenId',
+    'OptInRequired',
+    'RequestExpired',
+    'SignatureDoesNotMatch',
+    'UnauthorizedOperation',
+})
+
+# Splits an error message into words, keeping instance IDs intact
+_MESSAGE_WORD_SEPARATOR = re.compile(r'[^\w-]+')
+
+# Completed describe results keyed by (region, tag_key, tag_value, states),
+# each stored with its expiry time. Kept at module level so warm Lambda
+# invocations of the same container share it.
+_DESCRIBE_CACHE: Dict[Tuple[str, str, str, Tuple[str, ...]], Tuple[float, List[Dict[str, Any]]]] = {}
+_DESCRIBE_CACHE_LOCK = threading.Lock()
+
+# Number of times each region's cached describe results have been
+# invalidated. A stream only stores its result if no invalidation happened
+# while it was being consumed, as the instances it saw may since have stopped.
+_DESCRIBE_CACHE_GENERATIONS: Dict[str, int] = {}
+
+# Session shared by every client, so credentials are resolved only once
+_SESSION = boto3.session.Session()
+
+# Client configuration shared by every region. The HTTPS connection pool is
+# sized for concurrent calls and uses TCP keepalive; botocore's own retries
+# are disabled in favour of retry_with_exponential_backoff
+_CONFIG = Config(
+    max_pool_connections=MAX_CONCURRENT_REQUESTS,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'total_max_attempts': 1}
+)
+
+# Set when the process is asked to shut down (SIGTERM). Retry backoff and
+# rate-limit pacing wait on this event, so a pending retry is abandoned instead
+# of running past the end of the Lambda invocation.
+_shutdown_event = threading.Event()
+
+
+# Encodes a service NextToken into the opaque StartingToken format that
+# botocore paginators expect when resuming
+_TOKEN_ENCODER = TokenEncoder()
+
+
+# Accessors for the error code in a ClientError response, built once
+_get_error = operator.itemgetter('Error')
+_get_code = operator.itemgetter('Code')
+
+
+def _error_code(error: ClientError) -> str:
+    """
+    Return the AWS error code of a ClientError.
+    
+    Args:
+        error: ClientError raised by a boto3 call
+    
+    Returns:
+        Error code, or an empty string if the response has none
+    """
+    try:
+        return _get_code(_get_error(error.response))
+    except KeyError:
+        return ''
+
+
+def _instance_ids_in_error(error: ClientError, instance_ids: Sequence[str]) -> Set[str]:
+    """
+    Return the requested instance IDs that a ClientError's message names.
+    
+    Args:
+        error: ClientError raised by a boto3 call
+        instance_ids: Instance IDs sent in the failed request
+    
+    Returns:
+        Set of the instance IDs mentioned in the error message
+    """
+    message = error.response.get('Error', {}).get('Message', '')
+    return set(_MESSAGE_WORD_SEPARATOR.split(message)).intersection(instance_ids)
+
+
+def _is_retryable_error(error: ClientError) -> bool:
+    """
+    Check whether a ClientError signals throttling or a transient failure.
+    
+    Args:
+        error: ClientError raised by a boto3 call
+    
+    Returns:
+        True if the error code is one of the retryable AWS error codes
+    """
+    return _error_code(error) in _RETRYABLE_ERROR_CODES
+
+
+def _retry_after_seconds(error: ClientError) -> Optional[float]:
+    """
+    Read the delay requested by the service's Retry-After header, if any.
+    
+    Args:
+        error: ClientError raised by a boto3 call
+    
+    Returns:
+        Requested delay in seconds, or None if the header is missing or is
+        not a number of seconds
+    """
+    headers = error.response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+    retry_after = headers.get('retry-after')
+    if retry_after is None:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        return None
+
+
+def install_sigterm_handler() -> None:
+    """
+    Abandon pending retries when the process receives SIGTERM.
+    
+    The Lambda runtime sends SIGTERM shortly before it shuts the execution
+    environment down. The handler sets the shutdown event that retry backoff
+    and rate-limit pacing wait on, then calls any previously installed Python
+    handler. It does not end the process itself: pending retries give up and
+    the invocation unwinds and reports what it has done, and the runtime
+    kills the process once its grace period is over. Signal handlers can only
+    be installed from the main thread, so this does nothing when called from
+    another thread.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    
+    previous_handler = signal.getsignal(signal.SIGTERM)
+    
+    def handle_sigterm(signum, frame):
+        _shutdown_event.set()
+        if callable(previous_handler):
+            previous_handler(signum, frame)
+    
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+
+def clear_shutdown_event() -> None:
+    """
+    Forget a shutdown request left over from an earlier invocation.
+    
+    Called at the start of each invocation, so a SIGTERM that did not end a
+    warm container does not disable retries for every later invocation.
+    """
+    _shutdown_event.clear()
+
+
+def _sleep_before_retry(
+    attempt: int,
+    base_delay: float,
+    max_delay: float,
+    jitter: bool = True,
+    retry_after: Optional[float] = None
+) -> bool:
+    """
+    Sleep for a "full jitter" exponential backoff delay.
+    
+    The delay is drawn uniformly from [0, min(max_delay, base_delay * 2 ** attempt)],
+    or is exactly the upper bound when jitter is disabled. A delay requested
+    by the service through Retry-After replaces the computed one, still capped
+    at max_delay.
+    
+    Args:
+        attempt: Zero-based number of the attempt that just failed
+        base_delay: Base delay in seconds for exponential backoff
+        max_delay: Upper bound in seconds for a single backoff delay
+        jitter: Whether to randomize the delay (default: True)
+        retry_after: Delay in seconds requested by the service, if any
+    
+    Returns:
+        True if the caller should retry, False if shutdown was requested
+        before or during the wait
+    """
+    if retry_after is not None:
+        delay = min(max_delay, retry_after)
+    else:
+        delay = min(max_delay, base_delay * (2 ** attempt))
+        if jitter:
+            delay = random.uniform(0, delay)
+    if delay > 0:
+        return not _shutdown_event.wait(delay)
+    return not _shutdown_event.is_set()
+
+
+@lru_cache(maxsize=None)
+def _get_ec2_client(region: str) -> Any:
+    """
+    Return the boto3 EC2 client for a region, creating it on first use.
+    
+    Creating a client loads service models and builds endpoint resolvers, so
+    clients are cached per region and reused across warm Lambda invocations
+    of the same container. The cache is unbounded: there are only a few dozen
+    regions, and evicting a client would also reset its rate limiters. All
+    clients come from one shared session, so credentials are resolved once
+    per container rather than once per region.
+    
+    Every DescribeInstances and StopInstances request sent by the client,
+    including each page and each retry, first takes a token from the
+    region's rate limiter for that kind of action, so bursts are paced to
+    EC2's request rate limits before they can be throttled.
+    
+    Args:
+        region: AWS region for EC2 operations
+    
+    Returns:
+        boto3 EC2 client shared by every wrapper for the region
+    """
+    client = _SESSION.client('ec2', region_name=region, config=_CONFIG)
+    
+    describe_bucket = TokenBucket(DESCRIBE_RATE_LIMIT, DESCRIBE_BURST)
+    stop_bucket = TokenBucket(STOP_RATE_LIMIT, STOP_BURST)
+    client.meta.events.register(
+        'before-call.ec2.DescribeInstances',
+        lambda **kwargs: describe_bucket.acquire(_shutdown_event)
+    )
+    client.meta.events.register(
+        'before-call.ec2.StopInstances',
+        lambda **kwargs: stop_bucket.acquire(_shutdown_event)
+    )
+    return client
+
+
+@lru_cache(maxsize=32)
+def _build_filters(
+    tag_key: str,
+    tag_value: str,
+    states: Tuple[str, ...]
+) -> Tuple[Dict[str, Any], ...]:
+    """
+    Return the DescribeInstances filters for a tag and set of states.
+    
+    The filters are cached, as the same tag is queried on every invocation.
+    Callers must not modify the returned dictionaries.
+    
+    Args:
+        tag_key: EC2 tag key to filter instances
+        tag_value: EC2 tag value to filter instances
+        states: Instance state names to include
+    
+    Returns:
+        Tag filter followed by instance state filter
+    """
+    return (
+        {
+            'Name': f'tag:{tag_key}',
+            'Values': [tag_value]
+        },
+        {
+            'Name': 'instance-state-name',
+            'Values': list(states)
+        }
+    )
+
+
+def retry_with_exponential_backoff(
+    max_retries: int,
+    base_delay: float,
+    max_delay: float = 20.0,
+    jitter: bool = True
+) -> Callable:
     """
     Decorator that implements exponential backoff retry logic for AWS API calls.
     
     This decorator retries operations that fail with throttling errors
-    (RequestLimitExceeded) using exponential backoff. The delay between retries
-    doubles with each attempt: base_delay, base_delay * 2, base_delay * 4, etc.
+    (RequestLimitExceeded, Throttling, etc.) or transient service errors
+    (ServiceUnavailable, RequestTimeout) using exponential backoff with "full jitter": the
+    delay before each retry is drawn uniformly from
+    [0, min(max_delay, base_delay * 2 ** attempt)]. Randomizing the delay keeps
+    concurrent invocations that were throttled at the same moment from
+    retrying in lockstep and throttling each other again. When the error
+    response carries a Retry-After header, that delay is used instead.
     
     Args:
         max_retries: Maximum number of retry attempts
         base_delay: Base delay in seconds for exponential backoff
+        max_delay: Upper bound in seconds for a single backoff delay (default: 20.0)
+        jitter: Whether to randomize each delay; disable only where
+            deterministic delays are needed (default: True)
     
     Returns:
         Decorator function that wraps the target function with retry logic
@@ -32,7 +371,7 @@ def retry_with_exponential_backoff(max_retries: int, base_delay: float) -> Calla
     Example:
         @retry_with_exponential_backoff(max_retries=3, base_delay=1.0)
         def api_call():
-            # This will retry up to 3 times with delays of 1s, 2s, 4s
+            # This will retry up to 3 times with delays of up to 1s, 2s, 4s
             return client.some_operation()
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
@@ -42,18 +381,17 @@ def retry_with_exponential_backoff(max_retries: int, base_delay: float) -> Calla
                 try:
                     return func(*args, **kwargs)
                 except ClientError as e:
-                    error_code = e.response.get('Error', {}).get('Code', '')
-                    
-                    # Only retry on throttling errors
-                    if error_code == 'RequestLimitExceeded':
-                        # If this is not the last attempt, sleep and retry
-                        if attempt < max_retries - 1:
-                            delay = base_delay * (2 ** attempt)
-                            time.sleep(delay)
+                    # Only retry on retryable errors, only if this is not the
+                    # last attempt, and only if no shutdown was requested
+                    # during the backoff
+                    if _is_retryable_error(e) and attempt < max_retries - 1:
+                        if _sleep_before_retry(
+                            attempt, base_delay, max_delay, jitter, _retry_after_seconds(e)
+                        ):
                             continue
                     
-                    # Re-raise the error if it's not a throttling error
-                    # or if we've exhausted all retries
+                    # Re-raise the error if it's not a retryable error,
+                    # if we've exhausted all retries or if shutting down
                     raise
             
             # This should never be reached, but satisfies type checker
@@ -69,33 +407,69 @@ class EC2ClientWrapper:
     
     This class provides methods to interact with EC2 API for discovering
     and stopping instances, with built-in error handling and retry logic.
+    
+    Retries are owned by retry_with_exponential_backoff. The underlying boto3
+    client uses botocore's "adaptive" retry mode limited to a single attempt:
+    botocore's own retries are disabled so the two layers do not multiply,
+    while its client-side rate limiter still slows requests down as soon as
+    EC2 starts throttling.
     """
     
-    def __init__(self, region: str, max_retries: int = 3, base_delay: float = 1.0):
+    def __init__(
+        self,
+        region: str,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 20.0
+    ):
         """
         Initialize EC2 client with retry configuration.
         
+        The boto3 client for the region is created on first use and reused by
+        every later wrapper for the same region. Its HTTPS connection pool is
+        sized for concurrent calls and uses TCP keepalive, so pooled TLS
+        connections stay open between requests instead of being re-established.
+        
         Args:
             region: AWS region for EC2 operations
             max_retries: Maximum number of retry attempts for throttling errors
             base_delay: Base delay in seconds for exponential backoff
+            max_delay: Upper bound in seconds for a single backoff delay
         """
         self.region = region
         self.max_retries = max_retries
         self.base_delay = base_delay
-        self.client = boto3.client('ec2', region_name=region)
+        self.max_delay = max_delay
+        
+        client = _get_ec2_client(region)
+        self.client = client
+        
+        # Resolve the DescribeInstances paginator once; it is stateless and
+        # can be reused for every query
+        self._describe_instances_paginator = client.get_paginator('describe_instances')
+        
+        # Resolve and decorate the client's StopInstances method once here
+        # rather than on every call
+        self._stop_instances_with_retry = retry_with_exponential_backoff(
+            max_retries, base_delay, max_delay
+        )(client.stop_instances)
     
-    def describe_instances_by_tag(self, tag_key: str, tag_value: str) -> List[Dict[str, Any]]:
+    def describe_instances_by_tag(
+        self,
+        tag_key: str,
+        tag_value: str,
+        states: Sequence[str] = ('running',)
+    ) -> List[Dict[str, Any]]:
         """
-        Query instances with specified tag using pagination.
+        Query instances with specified tag and state using pagination.
         
-        This method uses boto3 paginator to handle large result sets and
-        returns all instances that match the specified tag key and value.
-        Includes retry logic with exponential backoff for throttling errors.
+        Convenience wrapper around iter_instances_by_tag that collects every
+        matching instance into a list.
         
         Args:
             tag_key: EC2 tag key to filter instances
             tag_value: EC2 tag value to filter instances
+            states: Instance state names to include (default: running only)
         
         Returns:
             List of instance dictionaries from EC2 API response
@@ -103,38 +477,160 @@ class EC2ClientWrapper:
         Raises:
             ClientError: If EC2 API call fails (authentication, permissions, etc.)
         """
-        @retry_with_exponential_backoff(self.max_retries, self.base_delay)
-        def _describe_with_retry():
-            instances = []
-            
-            # Create paginator for describe_instances
-            paginator = self.client.get_paginator('describe_instances')
-            
-            # Define filter for tag
-            filters = [
-                {
-                    'Name': f'tag:{tag_key}',
-                    'Values': [tag_value]
-                }
-            ]
+        return list(self.iter_instances_by_tag(tag_key, tag_value, states))
+    
+    def iter_instances_by_tag(
+        self,
+        tag_key: str,
+        tag_value: str,
+        states: Sequence[str] = ('running',)
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream instances with specified tag and state, page by page.
+        
+        A completed result is cached for DESCRIBE_CACHE_TTL seconds and
+        replayed for an identical query in the same region, without calling
+        EC2. A result is only cached once it has been fully consumed, and only
+        if the region's cache was not invalidated in the meantime. Stopping
+        instances through any wrapper for the region invalidates the cache.
+        
+        Both the tag and the instance states are sent to EC2 as filters, so
+        instances in other states (e.g. already stopped) never cross the wire. Pages are
+        requested with the maximum page size to minimize round trips, and
+        instances are yielded as each page arrives instead of being collected
+        first.
+        
+        If a page request is throttled, it is retried with exponential backoff
+        and pagination resumes from the last page already yielded, so no
+        instance is yielded twice.
+        
+        Args:
+            tag_key: EC2 tag key to filter instances
+            tag_value: EC2 tag value to filter instances
+            states: Instance state names to include (default: running only)
+        
+        Yields:
+            Instance dictionaries from EC2 API response
             
-            # Paginate through results
-            page_iterator = paginator.paginate(Filters=filters)
+        Raises:
+            ClientError: If EC2 API call fails (authentication, permissions, etc.)
+        """
+        cache_key = (self.region, tag_key, tag_value, tuple(states))
+        now = time.monotonic()
+        with _DESCRIBE_CACHE_LOCK:
+            entry = _DESCRIBE_CACHE.get(cache_key)
+            generation = _DESCRIBE_CACHE_GENERATIONS.get(self.region, 0)
+        if entry is not None and entry[0] > now:
+            yield from entry[1]
+            return
+        
+        instances: List[Dict[str, Any]] = []
+        for instance in self._paginate_instances_by_tag(tag_key, tag_value, states):
+            instances.append(instance)
+            yield instance
+        
+        expires_at = time.monotonic() + DESCRIBE_CACHE_TTL
+        with _DESCRIBE_CACHE_LOCK:
+            # Instances were stopped while the stream was consumed (e.g. by
+            # a caller stopping each batch as it arrives), so the result is
+            # already stale
+            if _DESCRIBE_CACHE_GENERATIONS.get(self.region, 0) != generation:
+                return
             
-            for page in page_iterator:
-                for reservation in page.get('Reservations', []):
-                    instances.extend(reservation.get('Instances', []))
+            # Drop expired entries, then the oldest ones if still full
+            for key in [k for k, (expiry, _) in _DESCRIBE_CACHE.items() if expiry <= now]:
+                del _DESCRIBE_CACHE[key]
+            while len(_DESCRIBE_CACHE) >= DESCRIBE_CACHE_MAX_ENTRIES:
+                del _DESCRIBE_CACHE[next(iter(_DESCRIBE_CACHE))]
+            _DESCRIBE_CACHE[cache_key] = (expires_at, instances)
+    
+    def invalidate_cache(self) -> None:
+        """
+        Discard cached describe results for this wrapper's region.
+        """
+        with _DESCRIBE_CACHE_LOCK:
+            for key in [k for k in _DESCRIBE_CACHE if k[0] == self.region]:
+                del _DESCRIBE_CACHE[key]
+            _DESCRIBE_CACHE_GENERATIONS[self.region] = (
+                _DESCRIBE_CACHE_GENERATIONS.get(self.region, 0) + 1
+            )
+    
+    def _paginate_instances_by_tag(
+        self,
+        tag_key: str,
+        tag_value: str,
+        states: Sequence[str]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream instances with specified tag and state from DescribeInstances.
+        
+        Args:
+            tag_key: EC2 tag key to filter instances
+            tag_value: EC2 tag value to filter instances
+            states: Instance state names to include
+        
+        Yields:
+            Instance dictionaries from EC2 API response
             
-            return instances
+        Raises:
+            ClientError: If EC2 API call fails (authentication, permissions, etc.)
+        """
+        paginator = self._describe_instances_paginator
+        
+        filters = list(_build_filters(tag_key, tag_value, tuple(states)))
         
-        return _describe_with_retry()
+        next_token: Optional[str] = None
+        attempt = 0
+        
+        while True:
+            pagination_config: Dict[str, Any] = {'PageSize': DESCRIBE_PAGE_SIZE}
+            if next_token is not None:
+                # The paginator takes its own encoded token, not the raw
+                # service token, as the resume point
+                pagination_config['StartingToken'] = _TOKEN_ENCODER.encode(
+                    {'NextToken': next_token}
+                )
+            
+            try:
+                # Paginate through results
+                page_iterator = paginator.paginate(
+                    Filters=filters,
+                    PaginationConfig=pagination_config
+                )
+                
+                for page in page_iterator:
+                    # Flatten the page's reservations into instances
+                    yield from chain.from_iterable(
+                        reservation.get('Instances', ())
+                        for reservation in page.get('Reservations', ())
+                    )
+                    
+                    # Remember where to resume if a later page is throttled
+                    next_token = page.get('NextToken')
+                    attempt = 0
+                
+                return
+            except ClientError as e:
+                if _is_retryable_error(e) and attempt < self.max_retries - 1:
+                    if _sleep_before_retry(
+                        attempt,
+                        self.base_delay,
+                        self.max_delay,
+                        retry_after=_retry_after_seconds(e)
+                    ):
+                        attempt += 1
+                        continue
+                raise
     
     def stop_instance(self, instance_id: str) -> bool:
         """
         Stop a single instance with retry logic.
         
         This method attempts to stop an EC2 instance and returns success status.
-        Includes exponential backoff retry logic for throttling errors.
+        It is a thin wrapper over stop_instances_batch for a single ID.
+        Includes exponential backoff retry logic for throttling errors. Errors
+        meaning the instance is already stopped or no longer exists are treated
+        as success, since the instance is in the desired state.
         
         Args:
             instance_id: EC2 instance ID to stop
@@ -142,17 +638,132 @@ class EC2ClientWrapper:
         Returns:
             True if instance stop was successful, False otherwise
         """
-        @retry_with_exponential_backoff(self.max_retries, self.base_delay)
-        def _stop_with_retry():
-            return self.client.stop_instances(InstanceIds=[instance_id])
-        
-        try:
-            _stop_with_retry()
-            return True
-        except ClientError as e:
-            # Log error details but return False to allow continued processing
-            error_code = e.response.get('Error', {}).get('Code', 'Unknown')
-            error_message = e.response.get('Error', {}).get('Message', str(e))
+        return self.stop_instances_batch([instance_id])[instance_id]
+    
+    def stop_instances_batch(self, instance_ids: List[str]) -> Dict[str, bool]:
+        """
+        Stop multiple instances with as few API calls as possible.
+        
+        Instance IDs are sent to StopInstances in chunks of up to
+        MAX_STOP_BATCH_SIZE, so N instances cost ceil(N / 1000) round trips
+        instead of N. When there is more than one chunk, chunks are stopped
+        concurrently on a thread pool so that one chunk's throttling backoff
+        does not hold up the others. EC2 rejects the whole request if any ID in
+        it is invalid or cannot be stopped; the instances named in such an
+        error are settled and the rest of the chunk is retried as one request.
+        Request-wide errors (exhausted throttling retries, missing
+        permissions) fail the whole chunk. Includes exponential backoff retry logic for
+        throttling errors.
+        
+        Args:
+            instance_ids: EC2 instance IDs to stop
+        
+        Returns:
+            Dictionary mapping each instance ID to True if the stop was
+            successful, False otherwise
+        """
+        if instance_ids:
+            # Cached describe results no longer reflect instance states
+            self.invalidate_cache()
+        
+        chunks = [
+            instance_ids[start:start + MAX_STOP_BATCH_SIZE]
+            for start in range(0, len(instance_ids), MAX_STOP_BATCH_SIZE)
+        ]
+        
+        if len(chunks) <= 1:
+            return self._stop_chunk(chunks[0]) if chunks else {}
+        
+        results: Dict[str, bool] = {}
+        max_workers = min(MAX_CONCURRENT_REQUESTS, len(chunks))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for chunk_results in pool.map(self._stop_chunk, chunks):
+                results.update(chunk_results)
+        
+        return results
+    
+    def _stop_chunk(self, instance_ids: List[str]) -> Dict[str, bool]:
+        """
+        Stop one chunk of instances with a single StopInstances request.
+        
+        If the request is rejected with an error naming particular instances
+        (e.g. unknown, stop-protected or unsupported instances), the named
+        instances are settled and the remaining ones are sent again in one
+        request. If an unknown, malformed or wrongly-stated instance is not
+        named, the instances are stopped individually to find it. Instances
+        that are already stopped or no longer exist count as success.
+        Throttling, authorization and other request-wide errors, and errors
+        naming no instance, fail every instance in the chunk rather than
+        repeating the request once per instance.
+        
+        Args:
+            instance_ids: EC2 instance IDs to stop (at most MAX_STOP_BATCH_SIZE)
+        
+        Returns:
+            Dictionary mapping each instance ID to its stop result
+        """
+        results: Dict[str, bool] = {}
+        remaining = instance_ids
+        
+        while True:
+            try:
+                response = self._stop_instances_with_retry(InstanceIds=remaining)
+            except ClientError as e:
+                code = _error_code(e)
+                if len(remaining) == 1:
+                    # Nothing left to stop; do not report as a failure
+                    results[remaining[0]] = code in _IGNORABLE_STOP_ERROR_CODES
+                    return results
+                
+                if code in _RETRYABLE_ERROR_CODES or code in _REQUEST_WIDE_ERROR_CODES:
+                    # The error applies to the whole request; stopping each
+                    # instance separately would only repeat it
+                    results.update(dict.fromkeys(remaining, False))
+                    return results
+                
+                named_ids = _instance_ids_in_error(e, remaining)
+                if not named_ids:
+                    if code in _INSTANCE_STOP_ERROR_CODES:
+                        results.update(self._stop_instances_individually(remaining))
+                    else:
+                        results.update(dict.fromkeys(remaining, False))
+                    return results
+                
+                # Settle the instances the error names and retry the rest
+                results.update(
+                    dict.fromkeys(named_ids, code in _IGNORABLE_STOP_ERROR_CODES)
+                )
+                remaining = [i for i in remaining if i not in named_ids]
+                if not remaining:
+                    return results
+                continue
             
-            # Return False for all errors to allow continued processing
-            return False
+            stopping_ids = {
+                item.get('InstanceId')
+                for item in response.get('StoppingInstances', [])
+            }
+            results.update(
+                (instance_id, instance_id in stopping_ids) for instance_id in remaining
+            )
+            return results
+    
+    def _stop_instances_individually(self, instance_ids: List[str]) -> Dict[str, bool]:
+        """
+        Stop instances one per API call, fanning the calls out over a thread pool.
+        
+        Each stop is a blocking HTTPS request, so running them concurrently
+        bounds wall time by the slowest call rather than the sum of all calls.
+        The underlying boto3 client is thread-safe and shared by all workers.
+        
+        Args:
+            instance_ids: EC2 instance IDs to stop
+        
+        Returns:
+            Dictionary mapping each instance ID to True if it was stopped
+        """
+        results: Dict[str, bool] = {}
+        max_workers = min(MAX_CONCURRENT_REQUESTS, len(instance_ids))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for chunk_results in pool.map(self._stop_chunk, ([i] for i in instance_ids)):
+                results.update(chunk_results)
+        return results
@@ -5,11 +5,18 @@ This module provides functionality to discover and filter EC2 instances
 that should be stopped based on tags and instance state.
 """
 
-from typing import List
+import sys
+from typing import Iterator, List
 from src.ec2_client import EC2ClientWrapper
 from src.models import InstanceInfo
 
 
+# Instance states in which an instance can be stopped, each mapped to one
+# canonical string so every InstanceInfo shares the same state object instead
+# of keeping its own copy parsed from the API response
+_STOPPABLE_STATES = {state: sys.intern(state) for state in ('running',)}
+
+
 class InstanceDiscoveryService:
     """
     Service for discovering EC2 instances that should be stopped.
@@ -31,9 +38,7 @@ class InstanceDiscoveryService:
         """
         Find all instances with specified tag that are in stoppable states.
         
-        This method queries EC2 for instances with the specified tag and filters
-        them to only include instances in "running" state. Instances in "stopped",
-        "stopping", "terminated", or "terminating" states are excluded.
+        Collects the results of iter_instances_to_stop into a list.
         
         Args:
             tag_key: EC2 tag key to filter instances (e.g., "AutoShutdown")
@@ -42,38 +47,59 @@ class InstanceDiscoveryService:
         Returns:
             List of InstanceInfo objects for instances that should be stopped
         """
-        # Query EC2 for instances with the specified tag
-        instances = self.ec2_client.describe_instances_by_tag(tag_key, tag_value)
+        return list(self.iter_instances_to_stop(tag_key, tag_value))
+    
+    def iter_instances_to_stop(self, tag_key: str, tag_value: str) -> Iterator[InstanceInfo]:
+        """
+        Stream instances with specified tag that are in stoppable states.
+        
+        This method streams instances with the specified tag from EC2 and yields
+        InstanceInfo objects in a single pass, as each describe page arrives.
+        Only instances in "running" state are included; the state filter is
+        sent with the DescribeInstances request so EC2 applies it server-side,
+        and the check is repeated here so instances in
+        "stopped", "stopping", "terminated", or "terminating" states are
+        excluded regardless of what the client returns.
+        
+        Args:
+            tag_key: EC2 tag key to filter instances (e.g., "AutoShutdown")
+            tag_value: EC2 tag value to filter instances (e.g., "yes")
         
-        # Filter and transform instances
-        instances_to_stop = []
+        Yields:
+            InstanceInfo objects for instances that should be stopped
+        """
+        # Stream instances with the specified tag from EC2, letting EC2 drop
+        # instances in other states before they are sent
+        instances = self.ec2_client.iter_instances_by_tag(
+            tag_key,
+            tag_value,
+            states=tuple(_STOPPABLE_STATES)
+        )
         
         for instance in instances:
-            # Get instance state
-            state = instance.get('State', {}).get('Name', '')
-            
-            # Only include instances in "running" state
-            if state != 'running':
+            # Get instance state, only including instances in a stoppable
+            # ("running") state
+            state = _STOPPABLE_STATES.get(instance.get('State', {}).get('Name', ''))
+            if state is None:
                 continue
             
             # Extract instance ID
             instance_id = instance.get('InstanceId', '')
             
-            # Extract instance name from 'Name' tag if present
-            instance_name = ''
-            tags = instance.get('Tags', [])
-            for tag in tags:
-                if tag.get('Key') == 'Name':
-                    instance_name = tag.get('Value', '')
-                    break
+            # Extract instance name from 'Name' tag if present; the scan
+            # stops at the first match, so only one tag is looked up and no
+            # per-instance tag dictionary is built
+            instance_name = next(
+                (
+                    tag.get('Value', '')
+                    for tag in instance.get('Tags') or ()
+                    if tag.get('Key') == 'Name'
+                ),
+                ''
+            )
             
-            # Create InstanceInfo object
-            instance_info = InstanceInfo(
+            yield InstanceInfo(
                 instance_id=instance_id,
                 instance_name=instance_name,
                 state=state
             )
-            
-            instances_to_stop.append(instance_info)
-        
-        return instances_to_stop
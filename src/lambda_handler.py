@@ -3,16 +3,208 @@ EC2 Auto-Shutdown Lambda Handler
 
 This module provides the main entry point for the AWS Lambda function that
 automatically shuts down EC2 instances based on tagging.
+
+The modules that import boto3 are loaded on first use rather than when this
+module is imported, so cold starts that fail configuration do not pay for
+importing boto3 and botocore.
 """
 
+import importlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict
+from functools import lru_cache
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from src.configuration import Configuration
 from src.logger import Logger
-from src.ec2_client import EC2ClientWrapper
-from src.instance_discovery import InstanceDiscoveryService
-from src.shutdown_orchestrator import ShutdownOrchestrator
+from src.models import ShutdownResult
+
+if TYPE_CHECKING:
+    from src.ec2_client import EC2ClientWrapper
+
+
+# Maximum number of regions processed concurrently
+MAX_REGION_WORKERS = 32
+
+# Names resolved on first use, mapped to the module that defines them
+_LAZY_IMPORTS = {
+    'EC2ClientWrapper': 'src.ec2_client',
+    'clear_shutdown_event': 'src.ec2_client',
+    'install_sigterm_handler': 'src.ec2_client',
+    'InstanceDiscoveryService': 'src.instance_discovery',
+    'ShutdownOrchestrator': 'src.shutdown_orchestrator',
+}
+
+# Module-level singleton reused across warm invocations of the same container
+_LOGGER: Optional[Logger] = None
+
+# Whether the SIGTERM handler that abandons retry backoffs is installed
+_SIGTERM_HANDLER_INSTALLED = False
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import a lazily loaded name on first access and keep it as a global.
+    
+    Args:
+        name: Attribute name being accessed
+    
+    Returns:
+        The imported object
+    
+    Raises:
+        AttributeError: If name is not a lazily loaded name
+    """
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def _resolve(name: str) -> Any:
+    """
+    Return a lazily loaded name, importing it if needed.
+    
+    Module globals are checked first, so a name replaced on this module (for
+    example by unittest.mock.patch) is returned as replaced.
+    
+    Args:
+        name: Lazily loaded name
+    
+    Returns:
+        The object bound to name
+    """
+    try:
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
+
+
+@lru_cache(maxsize=1)
+def _get_configuration() -> Configuration:
+    """
+    Return the configuration, loading it from the environment on first use.
+    
+    Environment variables do not change within a Lambda container, so the
+    parsed configuration is cached. Failed loads raise and are not cached.
+    
+    Returns:
+        Configuration shared by all invocations of this container
+    """
+    return Configuration.load()
+
+
+def _get_logger(config: Configuration) -> Logger:
+    """
+    Return the logger, creating it and wiring its handler on first use.
+    
+    Args:
+        config: Configuration providing the log level
+    
+    Returns:
+        Logger shared by all invocations of this container
+    """
+    global _LOGGER
+    if _LOGGER is None:
+        _LOGGER = Logger(level=config.log_level)
+    return _LOGGER
+
+
+def _install_sigterm_handler() -> None:
+    """
+    Install the SIGTERM handler that abandons retry backoffs, once per container.
+    """
+    global _SIGTERM_HANDLER_INSTALLED
+    if not _SIGTERM_HANDLER_INSTALLED:
+        _resolve('install_sigterm_handler')()
+        _SIGTERM_HANDLER_INSTALLED = True
+
+
+def _process_region(
+    ec2_client: 'EC2ClientWrapper',
+    region: str,
+    config: Configuration,
+    logger: Logger
+) -> ShutdownResult:
+    """
+    Discover and stop the tagged instances in one region.
+    
+    Errors are contained to the region: they are logged and returned as a
+    region-tagged entry in the result's errors, so one failing region (for
+    example one the account has not opted into) does not discard the results
+    of the others.
+    
+    Args:
+        ec2_client: EC2 client wrapper for the region
+        region: AWS region being processed
+        config: Configuration providing the tag filter
+        logger: Logger for recording operations
+    
+    Returns:
+        ShutdownResult for the region; its total_instances is the number of
+        instances discovered
+    """
+    try:
+        discovery_service = _resolve('InstanceDiscoveryService')(ec2_client)
+        
+        # Stream instances from the discovery service, so each batch is stopped
+        # while later describe pages are still being fetched
+        instances = discovery_service.iter_instances_to_stop(
+            config.tag_key,
+            config.tag_value
+        )
+        
+        # Nothing is running (the common case outside business hours)
+        first_instance = next(instances, None)
+        if first_instance is None:
+            return ShutdownResult(
+                total_instances=0,
+                successful_stops=0,
+                failed_stops=0,
+                errors=[]
+            )
+        
+        # Call orchestrator to shutdown instances, putting back the one peeked at
+        orchestrator = _resolve('ShutdownOrchestrator')(ec2_client, logger, region=region)
+        return orchestrator.shutdown_instances(chain((first_instance,), instances))
+    except Exception as e:
+        error_type = type(e).__name__
+        logger.error(
+            "Region processing failed",
+            region=region,
+            error_type=error_type,
+            error_message=str(e)
+        )
+        return ShutdownResult(
+            total_instances=0,
+            successful_stops=0,
+            failed_stops=0,
+            errors=[f"Processing failed in {region}: {error_type}: {e}"]
+        )
+
+
+def _merge_results(results: List[ShutdownResult]) -> ShutdownResult:
+    """
+    Combine per-region shutdown results into a single result.
+    
+    Args:
+        results: Per-region results
+    
+    Returns:
+        ShutdownResult with summed statistics and all error messages
+    """
+    if len(results) == 1:
+        return results[0]
+    
+    return ShutdownResult(
+        total_instances=sum(result.total_instances for result in results),
+        successful_stops=sum(result.successful_stops for result in results),
+        failed_stops=sum(result.failed_stops for result in results),
+        errors=[error for result in results for error in result.errors]
+    )
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -24,7 +216,11 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     2. Initializes all required components
     3. Discovers EC2 instances with the AutoShutdown tag
     4. Stops all discovered running instances
-    5. Logs execution summary with statistics
+    5. Logs one execution summary record with discovery and stop statistics
+    
+    Steps 3 and 4 run once per configured region. When several regions are
+    configured they are processed concurrently, so wall time is bounded by
+    the slowest region rather than the sum of all regions.
     
     Args:
         event: Lambda event data (not currently used)
@@ -33,7 +229,9 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Dictionary containing statusCode and execution summary with:
         - message: Human-readable status message
-        - result: Statistics including total_instances, successful_stops, failed_stops
+        - result: Statistics including total_instances, successful_stops,
+          failed_stops, and errors (failed stops, or a discovery failure after
+          some instances were already stopped)
         
     Raises:
         Exception: Top-level exceptions are caught, logged, and returned as error responses
@@ -42,10 +240,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     
     try:
         # Load configuration from environment variables
-        config = Configuration.load()
+        config = _get_configuration()
         
         # Initialize Logger
-        logger = Logger()
+        logger = _get_logger(config)
         
         # Log execution start with timestamp and region
         execution_start = datetime.utcnow().isoformat() + "Z"
@@ -53,58 +251,76 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             "Starting EC2 auto-shutdown execution",
             timestamp=execution_start,
             region=config.region,
+            regions=list(config.regions),
             tag_key=config.tag_key,
             tag_value=config.tag_value
         )
         
-        # Initialize EC2ClientWrapper with configuration
-        ec2_client = EC2ClientWrapper(
-            region=config.region,
-            max_retries=config.max_retries,
-            base_delay=config.retry_base_delay
-        )
-        
-        # Initialize InstanceDiscoveryService with EC2 client
-        discovery_service = InstanceDiscoveryService(ec2_client)
+        # Abandon pending retry backoffs when the runtime signals shutdown,
+        # starting every invocation with no shutdown requested
+        _install_sigterm_handler()
+        _resolve('clear_shutdown_event')()
         
-        # Initialize ShutdownOrchestrator with EC2 client and logger
-        orchestrator = ShutdownOrchestrator(ec2_client, logger)
+        # Initialize one EC2ClientWrapper per region up front; client
+        # creation is not thread-safe, so it stays on this thread
+        regions = config.regions
+        ec2_client_class = _resolve('EC2ClientWrapper')
+        ec2_clients = [
+            ec2_client_class(
+                region=region,
+                max_retries=config.max_retries,
+                base_delay=config.retry_base_delay,
+                max_delay=config.retry_max_delay
+            )
+            for region in regions
+        ]
         
-        # Call discovery service to find instances
-        instances = discovery_service.find_instances_to_stop(
-            config.tag_key,
-            config.tag_value
-        )
+        if len(regions) == 1:
+            results = [_process_region(ec2_clients[0], regions[0], config, logger)]
+        else:
+            # Overlap the network-bound work of all regions
+            max_workers = min(MAX_REGION_WORKERS, len(regions))
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = [
+                    pool.submit(_process_region, ec2_client, region, config, logger)
+                    for ec2_client, region in zip(ec2_clients, regions)
+                ]
+                results = [future.result() for future in futures]
         
-        # Log count of discovered instances
-        logger.info(
-            "Instance discovery completed",
-            instances_found=len(instances),
-            tag_key=config.tag_key,
-            tag_value=config.tag_value
-        )
-        
-        # Call orchestrator to shutdown instances
-        result = orchestrator.shutdown_instances(instances)
+        result = _merge_results(results)
         
-        # Log execution summary with statistics
-        logger.info(
+        # Log discovery and shutdown statistics as one summary record
+        logger.summary(
             "EC2 auto-shutdown execution completed",
-            total_instances=result.total_instances,
-            successful_stops=result.successful_stops,
-            failed_stops=result.failed_stops,
-            timestamp=datetime.utcnow().isoformat() + "Z"
+            {
+                "instances_found": {
+                    region: region_result.total_instances
+                    for region, region_result in zip(regions, results)
+                },
+                "tag_key": config.tag_key,
+                "tag_value": config.tag_value,
+                "total_instances": result.total_instances,
+                "successful_stops": result.successful_stops,
+                "failed_stops": result.failed_stops,
+                "errors": result.errors,
+                "timestamp": datetime.utcnow().isoformat() + "Z"
+            }
         )
         
         # Return structured response with execution summary
         return {
             "statusCode": 200,
             "body": {
-                "message": "Shutdown operation completed",
+                "message": (
+                    "Shutdown operation completed"
+                    if result.total_instances
+                    else "No instances to stop"
+                ),
                 "result": {
                     "total_instances": result.total_instances,
                     "successful_stops": result.successful_stops,
-                    "failed_stops": result.failed_stops
+                    "failed_stops": result.failed_stops,
+                    "errors": result.errors
                 }
             }
         }
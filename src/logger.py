@@ -4,12 +4,109 @@ Logger for EC2 Auto-Shutdown Lambda
 This module provides structured logging with JSON formatting for CloudWatch Logs Insights.
 All log messages include timestamp, log level, and message, with support for additional
 structured fields.
+
+If the optional orjson package is installed, it is used to serialize log
+entries; otherwise the standard library json module is used. Both write
+non-ASCII text as raw UTF-8, but they differ on non-finite floats: orjson
+writes NaN and Infinity as null, while json writes the non-standard NaN and
+Infinity literals.
 """
 
 import json
 import logging
-from datetime import datetime
-from typing import Any, Dict
+import sys
+import time
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ISO 8601 UTC format for the whole-second part of each log timestamp
+_ISOFMT_SECONDS = "%Y-%m-%dT%H:%M:%S"
+
+# Compact JSON separators; CloudWatch does not need the default whitespace
+_JSON_SEPARATORS = (',', ':')
+
+_time = time.time
+
+
+def _dumps_stdlib(log_entry: Dict[str, Any]) -> str:
+    """
+    Serialize a log entry to compact JSON with the standard library.
+    
+    Args:
+        log_entry: Log entry to serialize
+    
+    Returns:
+        JSON string
+    """
+    return json.dumps(log_entry, separators=_JSON_SEPARATORS, ensure_ascii=False)
+
+
+def _dumps_orjson(log_entry: Dict[str, Any]) -> str:
+    """
+    Serialize a log entry to compact JSON with orjson.
+    
+    Args:
+        log_entry: Log entry to serialize
+    
+    Returns:
+        JSON string
+    """
+    return orjson.dumps(log_entry).decode()
+
+
+_dumps = _dumps_orjson if orjson is not None else _dumps_stdlib
+
+# Most recently formatted whole second and its ISO 8601 prefix
+_last_second: Tuple[int, str] = (-1, "")
+
+
+def _timestamp() -> str:
+    """
+    Return the current UTC time as an ISO 8601 string with millisecond precision.
+    
+    Reads the clock with time.time() instead of building a datetime object,
+    and reuses the formatted date/time prefix while the second has not
+    changed, so most calls only format the milliseconds.
+    
+    Returns:
+        Timestamp such as "2024-01-01T12:00:00.123Z"
+    """
+    global _last_second
+    now = _time()
+    second = int(now)
+    cached_second, prefix = _last_second
+    if second != cached_second:
+        prefix = time.strftime(_ISOFMT_SECONDS, time.gmtime(second))
+        _last_second = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1000):03d}Z"
+
+
+class _JSONLineHandler(logging.Handler):
+    """
+    Logging handler that writes pre-formatted JSON lines straight to stdout.
+    
+    Log messages are already serialized by Logger, so this handler skips the
+    Formatter machinery and writes the message text as-is. Lambda captures
+    stdout and forwards each line to CloudWatch Logs.
+    """
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Write the record's message as a single line.
+        
+        Args:
+            record: Log record whose msg is a JSON string
+        """
+        try:
+            stream = sys.stdout
+            stream.write(record.msg + "\n")
+            stream.flush()
+        except Exception:
+            self.handleError(record)
 
 
 class Logger:
@@ -26,32 +123,37 @@ class Logger:
     Example:
         logger = Logger()
         logger.info("Instance stopped", instance_id="i-123", state="stopped")
-        # Output: {"timestamp": "2024-01-01T12:00:00Z", "level": "INFO", 
-        #          "message": "Instance stopped", "instance_id": "i-123", "state": "stopped"}
+        # Output: {"timestamp":"2024-01-01T12:00:00.000Z","level":"INFO",
+        #          "message":"Instance stopped","instance_id":"i-123","state":"stopped"}
+    
+    Messages below the configured level return before any JSON formatting.
     """
     
-    def __init__(self, name: str = "ec2-auto-shutdown"):
+    _INFO = logging.INFO
+    _WARNING = logging.WARNING
+    _ERROR = logging.ERROR
+    
+    def __init__(self, name: str = "ec2-auto-shutdown", level: str = "INFO"):
         """
         Initialize the logger.
         
         Args:
             name: Logger name (default: "ec2-auto-shutdown")
+            level: Minimum level to emit: INFO, WARNING or ERROR (default: "INFO")
         """
         self._logger = logging.getLogger(name)
-        self._logger.setLevel(logging.INFO)
+        self._logger.setLevel(level)
         
         # Remove any existing handlers to avoid duplicates
         self._logger.handlers.clear()
         
-        # Create console handler for Lambda (Lambda captures stdout/stderr)
-        handler = logging.StreamHandler()
-        handler.setLevel(logging.INFO)
+        # Write JSON lines directly to stdout (Lambda captures stdout); messages
+        # are already formatted, so no Formatter is involved
+        self._logger.addHandler(_JSONLineHandler())
         
-        # Use basic formatter since we'll format as JSON in our methods
-        formatter = logging.Formatter('%(message)s')
-        handler.setFormatter(formatter)
-        
-        self._logger.addHandler(handler)
+        # Do not also pass records to the root logger, which the Lambda
+        # runtime configures with its own handler
+        self._logger.propagate = False
     
     def _format_log(self, level: str, message: str, **kwargs: Any) -> str:
         """
@@ -62,20 +164,39 @@ class Logger:
             message: Human-readable message
             **kwargs: Additional structured fields
         
+        Returns:
+            JSON-formatted log string
+        """
+        return self._format_fields(level, message, kwargs)
+    
+    def _format_fields(
+        self,
+        level: str,
+        message: str,
+        fields: Optional[Dict[str, Any]]
+    ) -> str:
+        """
+        Format log message with a dictionary of structured fields as JSON.
+        
+        Args:
+            level: Log level (INFO, WARNING, ERROR)
+            message: Human-readable message
+            fields: Additional structured fields, or None
+        
         Returns:
             JSON-formatted log string
         """
         log_entry: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _timestamp(),
             "level": level,
             "message": message
         }
         
         # Add any additional structured fields
-        if kwargs:
-            log_entry.update(kwargs)
+        if fields:
+            log_entry.update(fields)
         
-        return json.dumps(log_entry)
+        return _dumps(log_entry)
     
     def info(self, message: str, **kwargs: Any) -> None:
         """
@@ -88,9 +209,31 @@ class Logger:
         Example:
             logger.info("Starting execution", region="us-east-1")
         """
+        if not self._logger.isEnabledFor(self._INFO):
+            return
         log_message = self._format_log("INFO", message, **kwargs)
         self._logger.info(log_message)
     
+    def summary(self, message: str, event: Dict[str, Any]) -> None:
+        """
+        Log a single informational record summarizing a whole execution.
+        
+        The summary is emitted as one log entry with the event nested under
+        a "summary" field, so per-stage statistics can be reported together
+        instead of as separate entries.
+        
+        Args:
+            message: Human-readable message
+            event: Summary statistics (e.g., {"total_instances": 2})
+        
+        Example:
+            logger.summary("Execution completed", {"total_instances": 2, "failed_stops": 0})
+        """
+        if not self._logger.isEnabledFor(self._INFO):
+            return
+        log_message = self._format_fields("INFO", message, {"summary": event})
+        self._logger.info(log_message)
+    
     def warning(self, message: str, **kwargs: Any) -> None:
         """
         Log warning message.
@@ -102,6 +245,8 @@ class Logger:
         Example:
             logger.warning("Instance already stopped", instance_id="i-123")
         """
+        if not self._logger.isEnabledFor(self._WARNING):
+            return
         log_message = self._format_log("WARNING", message, **kwargs)
         self._logger.warning(log_message)
     
@@ -117,5 +262,7 @@ class Logger:
             logger.error("Failed to stop instance", instance_id="i-123", 
                         error_type="InsufficientInstanceCapacity")
         """
+        if not self._logger.isEnabledFor(self._ERROR):
+            return
         log_message = self._format_log("ERROR", message, **kwargs)
         self._logger.error(log_message)
@@ -9,13 +9,14 @@ from dataclasses import dataclass
 from typing import List
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class InstanceInfo:
     """
     Information about an EC2 instance.
     
     This class represents the essential information about an EC2 instance
-    needed for the auto-shutdown process.
+    needed for the auto-shutdown process. Instances are immutable and use
+    __slots__, so large discovery results carry no per-object __dict__.
     
     Attributes:
         instance_id: EC2 instance ID (e.g., "i-1234567890abcdef0")
@@ -27,7 +28,7 @@ class InstanceInfo:
     state: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ShutdownResult:
     """
     Result of a shutdown operation.
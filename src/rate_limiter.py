@@ -0,0 +1,72 @@
+"""
+Rate Limiter for EC2 Auto-Shutdown Lambda
+
+This module provides a thread-safe token bucket used to pace EC2 API
+requests so bursts stay within the account's request rate limits.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    
+    The bucket holds up to capacity tokens and refills at rate tokens per
+    second. Each request takes one token; when the bucket is empty the
+    caller sleeps until its token has been refilled. Tokens are reserved
+    under the lock and the wait happens outside it, so concurrent callers
+    are paced one after another instead of all waking at the same moment.
+    
+    Example:
+        bucket = TokenBucket(rate=20.0, capacity=100.0)
+        bucket.acquire()  # Returns immediately while tokens remain
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize a full bucket.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        
+        Raises:
+            ValueError: If rate or capacity is not positive
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, cancel_event: Optional[threading.Event] = None) -> None:
+        """
+        Take one token, sleeping until it is available if the bucket is empty.
+        
+        Args:
+            cancel_event: Event that ends the wait early when set, so a
+                shutdown is not held up by pacing (default: None)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._last_refill) * self.rate
+            )
+            self._last_refill = now
+            
+            # Reserve the token now; a negative balance is the caller's wait
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        
+        if wait > 0:
+            if cancel_event is not None:
+                cancel_event.wait(wait)
+            else:
+                time.sleep(wait)
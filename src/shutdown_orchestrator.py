@@ -5,78 +5,152 @@ This module coordinates the shutdown of multiple EC2 instances,
 collecting statistics and handling errors gracefully.
 """
 
-from typing import List
+from itertools import islice
+from typing import Iterable, List, Optional
 from src.models import InstanceInfo, ShutdownResult
-from src.ec2_client import EC2ClientWrapper
+from src.ec2_client import EC2ClientWrapper, MAX_STOP_BATCH_SIZE
 from src.logger import Logger
 
 
+# Maximum instance IDs per aggregated success log entry, keeping each entry
+# well under the CloudWatch Logs event size limit
+SUCCESS_LOG_CHUNK_SIZE = 500
+
+
 class ShutdownOrchestrator:
     """
     Coordinates the shutdown of multiple EC2 instances.
     
     This class manages the process of stopping multiple instances,
-    collecting success/failure statistics, and logging each operation.
+    collecting success/failure statistics, and logging the outcome.
     Individual failures do not prevent other instances from being processed.
     """
     
-    def __init__(self, ec2_client: EC2ClientWrapper, logger: Logger):
+    def __init__(
+        self,
+        ec2_client: EC2ClientWrapper,
+        logger: Logger,
+        region: Optional[str] = None
+    ):
         """
         Initialize the orchestrator with EC2 client and logger.
         
         Args:
             ec2_client: EC2 client wrapper for stopping instances
             logger: Logger for recording operations
+            region: AWS region the instances are in; when given, it is added
+                to every log entry and error message, so output from regions
+                processed concurrently can be told apart
         """
         self.ec2_client = ec2_client
         self.logger = logger
+        self.region = region
+        self._log_fields = {"region": region} if region else {}
+        self._error_suffix = f" in {region}" if region else ""
     
-    def shutdown_instances(self, instances: List[InstanceInfo]) -> ShutdownResult:
+    def shutdown_instances(self, instances: Iterable[InstanceInfo]) -> ShutdownResult:
         """
         Stop all instances and return summary.
         
-        This method iterates through all provided instances, attempts to stop each,
-        and collects statistics. Processing continues even if individual stops fail.
-        Each operation is logged with appropriate level (INFO for success, ERROR for failure).
+        This method consumes the instances in batches of up to
+        MAX_STOP_BATCH_SIZE, stops each batch with a single call to the EC2
+        client, then walks the per-instance results to collect statistics.
+        Because instances are consumed lazily, a generator (such as
+        InstanceDiscoveryService.iter_instances_to_stop) can be passed in and
+        stops start while later describe pages are still being fetched, without
+        materializing the full instance list.
+        
+        Processing continues even if individual stops fail.
+        Each failure is logged individually at ERROR level; successes are
+        aggregated into INFO entries listing the stopped instance IDs, so a
+        large shutdown does not produce one log event per instance.
+        
+        If iterating the instances raises (for example a describe page fails
+        after its retries), the instances received before the failure are
+        still stopped, the error is logged and added to the result's errors,
+        and the result covers every instance stopped so far.
         
         Args:
-            instances: List of instances to stop
+            instances: Instances to stop (any iterable)
         
         Returns:
             ShutdownResult with statistics and error messages
         """
-        total_instances = len(instances)
+        total_instances = 0
         successful_stops = 0
         failed_stops = 0
         errors = []
+        successful_ids: List[str] = []
         
-        for instance in instances:
-            instance_id = instance.instance_id
-            instance_name = instance.instance_name
-            
-            # Attempt to stop the instance
-            success = self.ec2_client.stop_instance(instance_id)
-            
-            if success:
-                successful_stops += 1
-                # Log successful stop with instance details
-                self.logger.info(
-                    "Successfully stopped instance",
-                    instance_id=instance_id,
-                    instance_name=instance_name
+        instance_iterator = iter(instances)
+        stream_error: Optional[Exception] = None
+        
+        try:
+            while stream_error is None:
+                batch: List[InstanceInfo] = []
+                try:
+                    for instance in islice(instance_iterator, MAX_STOP_BATCH_SIZE):
+                        batch.append(instance)
+                except Exception as e:
+                    # The instance stream (e.g. a later describe page) failed;
+                    # the instances received so far are still stopped below
+                    stream_error = e
+                if not batch:
+                    break
+                total_instances += len(batch)
+                
+                # Stop the whole batch with a single API call
+                stop_results = self.ec2_client.stop_instances_batch(
+                    [instance.instance_id for instance in batch]
                 )
-            else:
-                failed_stops += 1
-                error_msg = f"Failed to stop instance {instance_id}"
-                if instance_name:
-                    error_msg += f" ({instance_name})"
-                errors.append(error_msg)
                 
-                # Log failure with instance details
+                for instance in batch:
+                    instance_id = instance.instance_id
+                    instance_name = instance.instance_name
+                    
+                    success = stop_results.get(instance_id, False)
+                    
+                    if success:
+                        successful_stops += 1
+                        successful_ids.append(instance_id)
+                    else:
+                        failed_stops += 1
+                        error_msg = f"Failed to stop instance {instance_id}"
+                        if instance_name:
+                            error_msg += f" ({instance_name})"
+                        errors.append(error_msg + self._error_suffix)
+                        
+                        # Log failure with instance details
+                        self.logger.error(
+                            "Failed to stop instance",
+                            instance_id=instance_id,
+                            instance_name=instance_name,
+                            **self._log_fields
+                        )
+            
+            if stream_error is not None:
+                error_type = type(stream_error).__name__
+                errors.append(
+                    f"Instance discovery failed{self._error_suffix}: "
+                    f"{error_type}: {stream_error}"
+                )
                 self.logger.error(
-                    "Failed to stop instance",
-                    instance_id=instance_id,
-                    instance_name=instance_name
+                    "Instance discovery failed",
+                    error_type=error_type,
+                    error_message=str(stream_error),
+                    instances_processed=total_instances,
+                    **self._log_fields
+                )
+        finally:
+            # Log successful stops in aggregated entries, even if stopping
+            # was interrupted, so no stopped instance goes unreported
+            for start in range(0, len(successful_ids), SUCCESS_LOG_CHUNK_SIZE):
+                chunk = successful_ids[start:start + SUCCESS_LOG_CHUNK_SIZE]
+                self.logger.info(
+                    "Successfully stopped instances",
+                    instance_ids=chunk,
+                    count=len(chunk),
+                    **self._log_fields
                 )
         
         return ShutdownResult(
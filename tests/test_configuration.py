@@ -4,6 +4,7 @@ Unit tests for Configuration Manager
 Tests configuration loading from environment variables with defaults.
 """
 
+import dataclasses
 import os
 import pytest
 from src.configuration import Configuration
@@ -18,7 +19,7 @@ class TestConfiguration:
         os.environ['AWS_REGION'] = 'us-east-1'
         
         # Clear optional environment variables
-        for key in ['TAG_KEY', 'TAG_VALUE', 'MAX_RETRIES', 'RETRY_BASE_DELAY']:
+        for key in ['TAG_KEY', 'TAG_VALUE', 'REGIONS', 'MAX_RETRIES', 'RETRY_BASE_DELAY', 'RETRY_MAX_DELAY', 'LOG_LEVEL']:
             os.environ.pop(key, None)
         
         config = Configuration.load()
@@ -26,8 +27,11 @@ class TestConfiguration:
         assert config.tag_key == 'AutoShutdown'
         assert config.tag_value == 'yes'
         assert config.region == 'us-east-1'
+        assert config.regions == ('us-east-1',)
         assert config.max_retries == 3
         assert config.retry_base_delay == 1.0
+        assert config.retry_max_delay == 20.0
+        assert config.log_level == 'INFO'
     
     def test_load_with_custom_values(self):
         """Test that environment variables override defaults"""
@@ -36,6 +40,8 @@ class TestConfiguration:
         os.environ['AWS_REGION'] = 'eu-west-1'
         os.environ['MAX_RETRIES'] = '5'
         os.environ['RETRY_BASE_DELAY'] = '2.5'
+        os.environ['RETRY_MAX_DELAY'] = '30.0'
+        os.environ['LOG_LEVEL'] = 'warning'
         
         config = Configuration.load()
         
@@ -44,6 +50,8 @@ class TestConfiguration:
         assert config.region == 'eu-west-1'
         assert config.max_retries == 5
         assert config.retry_base_delay == 2.5
+        assert config.retry_max_delay == 30.0
+        assert config.log_level == 'WARNING'
     
     def test_load_missing_region_raises_error(self):
         """Test that missing AWS_REGION raises ValueError"""
@@ -60,6 +68,17 @@ class TestConfiguration:
         with pytest.raises(ValueError, match="AWS_REGION environment variable must be set and not empty"):
             Configuration.load()
     
+    def test_load_invalid_log_level_raises_error(self):
+        """Test that an unsupported LOG_LEVEL raises ValueError"""
+        os.environ['AWS_REGION'] = 'us-east-1'
+        os.environ['LOG_LEVEL'] = 'VERBOSE'
+        
+        try:
+            with pytest.raises(ValueError, match="LOG_LEVEL environment variable must be one of"):
+                Configuration.load()
+        finally:
+            os.environ.pop('LOG_LEVEL', None)
+    
     def test_region_from_aws_region_variable(self):
         """Test that region is loaded from AWS_REGION environment variable"""
         os.environ['AWS_REGION'] = 'ap-southeast-2'
@@ -67,3 +86,25 @@ class TestConfiguration:
         config = Configuration.load()
         
         assert config.region == 'ap-southeast-2'
+    
+    def test_regions_from_regions_variable(self):
+        """Test that REGIONS is parsed as a comma-separated list of regions"""
+        os.environ['AWS_REGION'] = 'us-east-1'
+        os.environ['REGIONS'] = 'us-east-1, eu-west-1,,ap-southeast-2 '
+        
+        try:
+            config = Configuration.load()
+        finally:
+            os.environ.pop('REGIONS', None)
+        
+        assert config.region == 'us-east-1'
+        assert config.regions == ('us-east-1', 'eu-west-1', 'ap-southeast-2')
+    
+    def test_configuration_is_immutable(self):
+        """Test that a loaded configuration cannot be modified"""
+        os.environ['AWS_REGION'] = 'us-east-1'
+        
+        config = Configuration.load()
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.region = 'eu-west-1'
@@ -5,28 +5,114 @@ Tests the EC2 client wrapper functionality including instance discovery
 and stop operations with mocked boto3 responses.
 """
 
+import base64
 import pytest
+import random
+import signal
+import threading
 import time
 from unittest.mock import Mock, MagicMock, patch
+import boto3
 from botocore.exceptions import ClientError
-from src.ec2_client import EC2ClientWrapper, retry_with_exponential_backoff
+from botocore.paginate import TokenEncoder
+from botocore.stub import Stubber
+from src.ec2_client import (
+    EC2ClientWrapper,
+    DESCRIBE_CACHE_TTL,
+    DESCRIBE_PAGE_SIZE,
+    DESCRIBE_RATE_LIMIT,
+    MAX_CONCURRENT_REQUESTS,
+    MAX_STOP_BATCH_SIZE,
+    STOP_RATE_LIMIT,
+    _DESCRIBE_CACHE,
+    _get_ec2_client,
+    _shutdown_event,
+    clear_shutdown_event,
+    install_sigterm_handler,
+    retry_with_exponential_backoff
+)
+from src.instance_discovery import InstanceDiscoveryService
+from src.shutdown_orchestrator import ShutdownOrchestrator
 
 
 @pytest.fixture
 def mock_ec2_client():
     """Create a mock EC2 client for testing."""
-    with patch('boto3.client') as mock_client:
-        yield mock_client
+    _get_ec2_client.cache_clear()
+    _DESCRIBE_CACHE.clear()
+    with patch('src.ec2_client._SESSION') as mock_session:
+        yield mock_session.client
+    _get_ec2_client.cache_clear()
+    _DESCRIBE_CACHE.clear()
 
 
 def test_ec2_client_initialization(mock_ec2_client):
     """Test EC2ClientWrapper initializes with correct parameters."""
-    wrapper = EC2ClientWrapper(region='us-east-1', max_retries=5, base_delay=2.0)
+    wrapper = EC2ClientWrapper(region='us-east-1', max_retries=5, base_delay=2.0, max_delay=10.0)
     
     assert wrapper.region == 'us-east-1'
     assert wrapper.max_retries == 5
     assert wrapper.base_delay == 2.0
-    mock_ec2_client.assert_called_once_with('ec2', region_name='us-east-1')
+    assert wrapper.max_delay == 10.0
+    mock_ec2_client.assert_called_once()
+    call_args = mock_ec2_client.call_args
+    assert call_args[0] == ('ec2',)
+    assert call_args[1]['region_name'] == 'us-east-1'
+    assert call_args[1]['config'].max_pool_connections == MAX_CONCURRENT_REQUESTS
+    assert call_args[1]['config'].tcp_keepalive is True
+    # botocore's own retries are disabled in favour of the retry decorator
+    assert call_args[1]['config'].retries == {'mode': 'adaptive', 'total_max_attempts': 1}
+    
+    # The DescribeInstances paginator is resolved once, up front
+    mock_ec2_client.return_value.get_paginator.assert_called_once_with('describe_instances')
+    
+    # A second wrapper in the same region does not build another client
+    EC2ClientWrapper(region='us-east-1')
+    mock_ec2_client.assert_called_once()
+    assert _get_ec2_client.cache_info().hits == 1
+
+
+def test_ec2_client_reused_within_region(mock_ec2_client):
+    """Test wrappers for the same region share one boto3 client."""
+    first = EC2ClientWrapper(region='us-east-1')
+    second = EC2ClientWrapper(region='us-east-1')
+    other_region = EC2ClientWrapper(region='eu-west-1')
+    
+    assert first.client is second.client
+    assert mock_ec2_client.call_count == 2
+    assert mock_ec2_client.call_args_list[0][1]['region_name'] == 'us-east-1'
+    assert mock_ec2_client.call_args_list[1][1]['region_name'] == 'eu-west-1'
+
+
+def test_ec2_client_reused_across_many_regions(mock_ec2_client):
+    """Test clients stay cached when more regions are cycled than MAX_CONCURRENT_REQUESTS."""
+    regions = [f'region-{n}' for n in range(MAX_CONCURRENT_REQUESTS + 1)]
+    
+    for _ in range(3):
+        for region in regions:
+            EC2ClientWrapper(region=region)
+    
+    assert mock_ec2_client.call_count == len(regions)
+
+
+def test_ec2_client_paces_describe_and_stop_requests(mock_ec2_client):
+    """Test the client takes a rate limiter token before each EC2 request."""
+    EC2ClientWrapper(region='us-east-1')
+    
+    register = mock_ec2_client.return_value.meta.events.register
+    handlers = {call.args[0]: call.args[1] for call in register.call_args_list}
+    assert set(handlers) == {
+        'before-call.ec2.DescribeInstances',
+        'before-call.ec2.StopInstances'
+    }
+    
+    with patch('src.ec2_client.TokenBucket.acquire', autospec=True) as mock_acquire:
+        handlers['before-call.ec2.DescribeInstances'](model=None, params={})
+        handlers['before-call.ec2.StopInstances'](model=None, params={})
+    
+    buckets = [call.args[0] for call in mock_acquire.call_args_list]
+    assert [bucket.rate for bucket in buckets] == [DESCRIBE_RATE_LIMIT, STOP_RATE_LIMIT]
+    assert all(call.args[1] is _shutdown_event for call in mock_acquire.call_args_list)
 
 
 def test_describe_instances_by_tag_single_page(mock_ec2_client):
@@ -63,6 +149,11 @@ def test_describe_instances_by_tag_single_page(mock_ec2_client):
     call_args = mock_paginator.paginate.call_args
     assert call_args[1]['Filters'][0]['Name'] == 'tag:AutoShutdown'
     assert call_args[1]['Filters'][0]['Values'] == ['yes']
+    assert call_args[1]['Filters'][1]['Name'] == 'instance-state-name'
+    assert call_args[1]['Filters'][1]['Values'] == ['running']
+    assert call_args[1]['PaginationConfig'] == {'PageSize': DESCRIBE_PAGE_SIZE}
+    # Pages are requested at the DescribeInstances MaxResults limit
+    assert call_args[1]['PaginationConfig']['PageSize'] == 1000
 
 
 def test_describe_instances_by_tag_multiple_pages(mock_ec2_client):
@@ -116,6 +207,213 @@ def test_describe_instances_by_tag_empty_results(mock_ec2_client):
     assert len(instances) == 0
 
 
+def test_describe_instances_by_tag_custom_states(mock_ec2_client):
+    """Test describe_instances_by_tag sends the requested states as a filter."""
+    mock_paginator = MagicMock()
+    mock_ec2_instance = mock_ec2_client.return_value
+    mock_ec2_instance.get_paginator.return_value = mock_paginator
+    mock_paginator.paginate.return_value = [{'Reservations': []}]
+    
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    wrapper.describe_instances_by_tag('AutoShutdown', 'yes', states=('running', 'pending'))
+    
+    filters = mock_paginator.paginate.call_args[1]['Filters']
+    assert filters[1] == {'Name': 'instance-state-name', 'Values': ['running', 'pending']}
+
+
+def test_describe_instances_by_tag_reuses_filters(mock_ec2_client):
+    """Test repeated queries for the same tag reuse the same filter dictionaries."""
+    mock_paginator = Mock()
+    mock_paginator.paginate.return_value = []
+    mock_ec2_client.return_value.get_paginator.return_value = mock_paginator
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    
+    wrapper.describe_instances_by_tag('AutoShutdown', 'yes')
+    wrapper.invalidate_cache()
+    wrapper.describe_instances_by_tag('AutoShutdown', 'yes')
+    
+    first, second = [call[1]['Filters'] for call in mock_paginator.paginate.call_args_list]
+    assert first == second
+    assert all(a is b for a, b in zip(first, second))
+
+
+def test_describe_instances_cache_hit(mock_ec2_client):
+    """Test identical describes within the TTL reuse the first result."""
+    mock_paginator = Mock()
+    mock_paginator.paginate.return_value = [
+        {'Reservations': [{'Instances': [{'InstanceId': 'i-123'}]}]}
+    ]
+    mock_ec2_client.return_value.get_paginator.return_value = mock_paginator
+    
+    first = EC2ClientWrapper(region='us-east-1').describe_instances_by_tag('AutoShutdown', 'yes')
+    second = EC2ClientWrapper(region='us-east-1').describe_instances_by_tag('AutoShutdown', 'yes')
+    
+    assert first == second == [{'InstanceId': 'i-123'}]
+    mock_paginator.paginate.assert_called_once()
+
+
+def test_describe_instances_cache_expires_and_invalidates(mock_ec2_client):
+    """Test cached describes expire after the TTL and are dropped by stops."""
+    mock_paginator = Mock()
+    mock_paginator.paginate.return_value = [
+        {'Reservations': [{'Instances': [{'InstanceId': 'i-123'}]}]}
+    ]
+    mock_ec2_client.return_value.get_paginator.return_value = mock_paginator
+    mock_ec2_client.return_value.stop_instances.return_value = {
+        'StoppingInstances': [{'InstanceId': 'i-123'}]
+    }
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    
+    with patch('src.ec2_client.time.monotonic') as mock_monotonic:
+        mock_monotonic.return_value = 100.0
+        wrapper.describe_instances_by_tag('AutoShutdown', 'yes')
+        mock_monotonic.return_value = 100.0 + DESCRIBE_CACHE_TTL - 1
+        wrapper.describe_instances_by_tag('AutoShutdown', 'yes')
+        assert mock_paginator.paginate.call_count == 1
+        
+        mock_monotonic.return_value = 100.0 + DESCRIBE_CACHE_TTL
+        wrapper.describe_instances_by_tag('AutoShutdown', 'yes')
+        assert mock_paginator.paginate.call_count == 2
+        
+        wrapper.stop_instances_batch(['i-123'])
+        wrapper.describe_instances_by_tag('AutoShutdown', 'yes')
+        assert mock_paginator.paginate.call_count == 3
+
+
+def test_describe_instances_not_cached_when_stopped_while_streaming(mock_ec2_client):
+    """Test a stream stopped batch by batch as it is consumed is not cached."""
+    instances = [
+        {'InstanceId': f'i-{n}', 'State': {'Name': 'running'}}
+        for n in range(MAX_STOP_BATCH_SIZE)
+    ]
+    mock_paginator = Mock()
+    mock_paginator.paginate.return_value = [{'Reservations': [{'Instances': instances}]}]
+    mock_ec2_client.return_value.get_paginator.return_value = mock_paginator
+    mock_ec2_client.return_value.stop_instances.side_effect = lambda InstanceIds: {
+        'StoppingInstances': [{'InstanceId': instance_id} for instance_id in InstanceIds]
+    }
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    discovery = InstanceDiscoveryService(wrapper)
+    orchestrator = ShutdownOrchestrator(wrapper, Mock())
+    
+    result = orchestrator.shutdown_instances(
+        discovery.iter_instances_to_stop('AutoShutdown', 'yes')
+    )
+    
+    assert result.successful_stops == MAX_STOP_BATCH_SIZE
+    assert _DESCRIBE_CACHE == {}
+    discovery.find_instances_to_stop('AutoShutdown', 'yes')
+    assert mock_paginator.paginate.call_count == 2
+
+
+def test_iter_instances_by_tag_streams_pages(mock_ec2_client):
+    """Test iter_instances_by_tag yields instances lazily as pages arrive."""
+    mock_paginator = MagicMock()
+    mock_ec2_instance = mock_ec2_client.return_value
+    mock_ec2_instance.get_paginator.return_value = mock_paginator
+    
+    pages_fetched = []
+    
+    def paginate(*args, **kwargs):
+        for n in (1, 2):
+            pages_fetched.append(n)
+            yield {'Reservations': [{'Instances': [{'InstanceId': f'i-{n}'}]}]}
+    
+    mock_paginator.paginate.side_effect = paginate
+    
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    instances = wrapper.iter_instances_by_tag('AutoShutdown', 'yes')
+    
+    assert next(instances)['InstanceId'] == 'i-1'
+    assert pages_fetched == [1]
+    assert next(instances)['InstanceId'] == 'i-2'
+    assert pages_fetched == [1, 2]
+
+
+def test_iter_instances_by_tag_resumes_after_throttling(mock_ec2_client):
+    """Test a throttled page is retried from the last token without duplicates."""
+    mock_paginator = MagicMock()
+    mock_ec2_instance = mock_ec2_client.return_value
+    mock_ec2_instance.get_paginator.return_value = mock_paginator
+    
+    def first_pass(*args, **kwargs):
+        yield {
+            'Reservations': [{'Instances': [{'InstanceId': 'i-111'}]}],
+            'NextToken': 'token-1'
+        }
+        raise ClientError(
+            {'Error': {'Code': 'RequestLimitExceeded', 'Message': 'Rate exceeded'}},
+            'DescribeInstances'
+        )
+    
+    def resumed_pass(*args, **kwargs):
+        yield {'Reservations': [{'Instances': [{'InstanceId': 'i-222'}]}]}
+    
+    mock_paginator.paginate.side_effect = iter((first_pass(), resumed_pass()))
+    
+    wrapper = EC2ClientWrapper(region='us-east-1', max_retries=3, base_delay=0.01)
+    with patch('src.ec2_client._shutdown_event.wait', return_value=False):
+        instances = list(wrapper.iter_instances_by_tag('AutoShutdown', 'yes'))
+    
+    assert [i['InstanceId'] for i in instances] == ['i-111', 'i-222']
+    assert mock_paginator.paginate.call_count == 2
+    resumed_config = mock_paginator.paginate.call_args_list[1][1]['PaginationConfig']
+    assert resumed_config == {
+        'PageSize': DESCRIBE_PAGE_SIZE,
+        'StartingToken': TokenEncoder().encode({'NextToken': 'token-1'})
+    }
+
+
+@pytest.mark.parametrize("next_token", [
+    base64.b64encode(b'{"page": 2}').decode(),
+    'opaque___1'
+])
+def test_iter_instances_by_tag_resumes_with_service_token(mock_ec2_client, next_token):
+    """Test the resumed request sends EC2's NextToken unchanged after throttling."""
+    client = boto3.session.Session(
+        aws_access_key_id='testing',
+        aws_secret_access_key='testing'
+    ).client('ec2', region_name='us-east-1')
+    mock_ec2_client.return_value = client
+    
+    expected_params = {
+        'Filters': [
+            {'Name': 'tag:AutoShutdown', 'Values': ['yes']},
+            {'Name': 'instance-state-name', 'Values': ['running']}
+        ],
+        'MaxResults': DESCRIBE_PAGE_SIZE
+    }
+    resumed_params = dict(expected_params, NextToken=next_token)
+    
+    with Stubber(client) as stubber:
+        stubber.add_response(
+            'describe_instances',
+            {
+                'Reservations': [{'Instances': [{'InstanceId': 'i-111'}]}],
+                'NextToken': next_token
+            },
+            expected_params
+        )
+        stubber.add_client_error(
+            'describe_instances',
+            service_error_code='RequestLimitExceeded',
+            expected_params=resumed_params
+        )
+        stubber.add_response(
+            'describe_instances',
+            {'Reservations': [{'Instances': [{'InstanceId': 'i-222'}]}]},
+            resumed_params
+        )
+        
+        wrapper = EC2ClientWrapper(region='us-east-1', max_retries=3, base_delay=0.01)
+        with patch('src.ec2_client._shutdown_event.wait', return_value=False):
+            instances = list(wrapper.iter_instances_by_tag('AutoShutdown', 'yes'))
+        
+        stubber.assert_no_pending_responses()
+    
+    assert [i['InstanceId'] for i in instances] == ['i-111', 'i-222']
+
+
 def test_stop_instance_success(mock_ec2_client):
     """Test stop_instance with successful stop operation."""
     mock_ec2_instance = mock_ec2_client.return_value
@@ -161,6 +459,269 @@ def test_stop_instance_generic_error(mock_ec2_client):
 
 
 
+@pytest.mark.parametrize('error_code', ['IncorrectInstanceState', 'InvalidInstanceID.NotFound'])
+def test_stop_instance_ignorable_error_counts_as_success(mock_ec2_client, error_code):
+    """Test stop_instance treats already-stopped or missing instances as success."""
+    mock_ec2_instance = mock_ec2_client.return_value
+    mock_ec2_instance.stop_instances.side_effect = ClientError(
+        {'Error': {'Code': error_code, 'Message': 'Nothing to stop'}},
+        'StopInstances'
+    )
+    
+    wrapper = EC2ClientWrapper(region='us-east-1', base_delay=0.01)
+    result = wrapper.stop_instance('i-123')
+    
+    assert result is True
+    # Not retried: the code is not a throttling error
+    mock_ec2_instance.stop_instances.assert_called_once()
+
+
+def test_stop_instances_batch_single_call(mock_ec2_client):
+    """Test stop_instances_batch stops all instances with one API call."""
+    mock_ec2_instance = mock_ec2_client.return_value
+    mock_ec2_instance.stop_instances.return_value = {
+        'StoppingInstances': [
+            {'InstanceId': 'i-111', 'CurrentState': {'Name': 'stopping'}},
+            {'InstanceId': 'i-222', 'CurrentState': {'Name': 'stopping'}},
+            {'InstanceId': 'i-333', 'CurrentState': {'Name': 'stopping'}}
+        ]
+    }
+    
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    results = wrapper.stop_instances_batch(['i-111', 'i-222', 'i-333'])
+    
+    assert results == {'i-111': True, 'i-222': True, 'i-333': True}
+    mock_ec2_instance.stop_instances.assert_called_once_with(
+        InstanceIds=['i-111', 'i-222', 'i-333']
+    )
+
+
+def test_stop_instances_batch(mock_ec2_client):
+    """Test stop_instances_batch stops N instances with one call and maps each ID."""
+    mock_ec2_instance = mock_ec2_client.return_value
+    mock_ec2_instance.stop_instances.return_value = {
+        'StoppingInstances': [
+            {'InstanceId': 'i-111', 'CurrentState': {'Name': 'stopping'}},
+            {'InstanceId': 'i-333', 'CurrentState': {'Name': 'stopping'}}
+        ]
+    }
+    
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    results = wrapper.stop_instances_batch(['i-111', 'i-222', 'i-333'])
+    
+    # An ID missing from StoppingInstances is reported as not stopped
+    assert results == {'i-111': True, 'i-222': False, 'i-333': True}
+    assert mock_ec2_instance.stop_instances.call_count == 1
+
+
+def test_stop_instance_delegates_to_batch(mock_ec2_client):
+    """Test stop_instance is a single-ID call to stop_instances_batch."""
+    mock_ec2_client.return_value.stop_instances.side_effect = ClientError(
+        {'Error': {'Code': 'UnauthorizedOperation', 'Message': 'Not authorized'}},
+        'StopInstances'
+    )
+    
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    with patch.object(
+        wrapper, 'stop_instances_batch', wraps=wrapper.stop_instances_batch
+    ) as mock_batch:
+        result = wrapper.stop_instance('i-123')
+    
+    assert result is False
+    mock_batch.assert_called_once_with(['i-123'])
+    # A failed single-ID request is not retried through the fallback path
+    mock_ec2_client.return_value.stop_instances.assert_called_once()
+
+
+def test_stop_instances_batch_chunks_large_lists(mock_ec2_client):
+    """Test stop_instances_batch splits requests at the EC2 per-call limit."""
+    mock_ec2_instance = mock_ec2_client.return_value
+    mock_ec2_instance.stop_instances.side_effect = lambda InstanceIds: {
+        'StoppingInstances': [{'InstanceId': i} for i in InstanceIds]
+    }
+    instance_ids = [f'i-{n}' for n in range(MAX_STOP_BATCH_SIZE + 1)]
+    
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    results = wrapper.stop_instances_batch(instance_ids)
+    
+    assert len(results) == MAX_STOP_BATCH_SIZE + 1
+    assert all(results.values())
+    assert mock_ec2_instance.stop_instances.call_count == 2
+    # Chunks run concurrently, so compare without relying on call order
+    chunk_sizes = sorted(
+        len(call[1]['InstanceIds'])
+        for call in mock_ec2_instance.stop_instances.call_args_list
+    )
+    assert chunk_sizes == [1, MAX_STOP_BATCH_SIZE]
+
+
+def test_stop_instances_batch_stops_chunks_concurrently(mock_ec2_client):
+    """Test stop_instances_batch issues the requests for separate chunks in parallel."""
+    mock_ec2_instance = mock_ec2_client.return_value
+    # Both chunk requests must be in flight at once to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    
+    def stop_instances(InstanceIds):
+        barrier.wait()
+        return {'StoppingInstances': [{'InstanceId': i} for i in InstanceIds]}
+    
+    mock_ec2_instance.stop_instances.side_effect = stop_instances
+    instance_ids = [f'i-{n}' for n in range(MAX_STOP_BATCH_SIZE + 1)]
+    
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    results = wrapper.stop_instances_batch(instance_ids)
+    
+    assert len(results) == MAX_STOP_BATCH_SIZE + 1
+    assert all(results.values())
+    assert mock_ec2_instance.stop_instances.call_count == 2
+
+
+def test_stop_instances_batch_retries_instances_not_named_in_error(mock_ec2_client):
+    """Test stop_instances_batch settles the IDs an error names and resends the rest."""
+    mock_ec2_instance = mock_ec2_client.return_value
+    
+    def stop_instances(InstanceIds):
+        if 'i-bad' in InstanceIds:
+            raise ClientError(
+                {'Error': {'Code': 'InvalidInstanceID.Malformed', 'Message': 'Invalid id: "i-bad"'}},
+                'StopInstances'
+            )
+        return {'StoppingInstances': [{'InstanceId': i} for i in InstanceIds]}
+    
+    mock_ec2_instance.stop_instances.side_effect = stop_instances
+    
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    results = wrapper.stop_instances_batch(['i-111', 'i-bad', 'i-333'])
+    
+    assert results == {'i-111': True, 'i-bad': False, 'i-333': True}
+    # One failed batch call followed by one call for the remaining instances
+    assert mock_ec2_instance.stop_instances.call_count == 2
+    mock_ec2_instance.stop_instances.assert_called_with(InstanceIds=['i-111', 'i-333'])
+
+
+def test_stop_instances_batch_missing_instances_count_as_stopped(mock_ec2_client):
+    """Test instances named in a NotFound error are treated as already gone."""
+    mock_ec2_instance = mock_ec2_client.return_value
+    mock_ec2_instance.stop_instances.side_effect = iter((
+        ClientError(
+            {'Error': {
+                'Code': 'InvalidInstanceID.NotFound',
+                'Message': "The instance IDs 'i-222, i-333' do not exist"
+            }},
+            'StopInstances'
+        ),
+        {'StoppingInstances': [{'InstanceId': 'i-111'}]}
+    ))
+    
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    results = wrapper.stop_instances_batch(['i-111', 'i-222', 'i-333'])
+    
+    assert results == {'i-111': True, 'i-222': True, 'i-333': True}
+    assert mock_ec2_instance.stop_instances.call_count == 2
+
+
+def test_stop_instances_batch_falls_back_when_error_names_no_instance(mock_ec2_client):
+    """Test instances are stopped one by one if the error does not say which one failed."""
+    mock_ec2_instance = mock_ec2_client.return_value
+    
+    def stop_instances(InstanceIds):
+        if len(InstanceIds) > 1 or InstanceIds == ['i-bad']:
+            raise ClientError(
+                {'Error': {'Code': 'IncorrectInstanceState', 'Message': 'Cannot stop instance'}},
+                'StopInstances'
+            )
+        return {'StoppingInstances': [{'InstanceId': i} for i in InstanceIds]}
+    
+    mock_ec2_instance.stop_instances.side_effect = stop_instances
+    
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    results = wrapper.stop_instances_batch(['i-111', 'i-bad', 'i-333'])
+    
+    assert results == {'i-111': True, 'i-bad': True, 'i-333': True}
+    # One failed batch call followed by three individual calls
+    assert mock_ec2_instance.stop_instances.call_count == 4
+
+
+@pytest.mark.parametrize("error_code,message", [
+    (
+        'OperationNotPermitted',
+        "The instance 'i-prot' may not be stopped. Modify its 'disableApiStop' "
+        "instance attribute and try again."
+    ),
+    (
+        'UnsupportedOperation',
+        "The instance 'i-prot' does not have an 'ebs' root device type and cannot be stopped."
+    )
+])
+def test_stop_instances_batch_stops_others_when_instance_cannot_be_stopped(
+    mock_ec2_client, error_code, message
+):
+    """Test an instance that cannot be stopped fails alone while the rest are resent."""
+    mock_ec2_instance = mock_ec2_client.return_value
+    
+    def stop_instances(InstanceIds):
+        if 'i-prot' in InstanceIds:
+            raise ClientError(
+                {'Error': {'Code': error_code, 'Message': message}},
+                'StopInstances'
+            )
+        return {'StoppingInstances': [{'InstanceId': i} for i in InstanceIds]}
+    
+    mock_ec2_instance.stop_instances.side_effect = stop_instances
+    
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    results = wrapper.stop_instances_batch(['i-1', 'i-prot', 'i-3'])
+    
+    assert results == {'i-1': True, 'i-prot': False, 'i-3': True}
+    assert mock_ec2_instance.stop_instances.call_count == 2
+    mock_ec2_instance.stop_instances.assert_called_with(InstanceIds=['i-1', 'i-3'])
+
+
+def test_stop_instances_batch_error_naming_no_instance_fails_chunk(mock_ec2_client):
+    """Test an unrecognized error that names no instance fails the chunk after one call."""
+    mock_ec2_instance = mock_ec2_client.return_value
+    mock_ec2_instance.stop_instances.side_effect = ClientError(
+        {'Error': {'Code': 'OperationNotPermitted', 'Message': 'Operation not permitted'}},
+        'StopInstances'
+    )
+    
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    results = wrapper.stop_instances_batch(['i-1', 'i-2'])
+    
+    assert results == {'i-1': False, 'i-2': False}
+    mock_ec2_instance.stop_instances.assert_called_once()
+
+
+@pytest.mark.parametrize("error_code", ['RequestLimitExceeded', 'UnauthorizedOperation'])
+def test_stop_instances_batch_request_wide_error_fails_chunk(mock_ec2_client, error_code):
+    """Test errors not tied to particular instances fail the chunk without per-instance stops."""
+    mock_ec2_instance = mock_ec2_client.return_value
+    mock_ec2_instance.stop_instances.side_effect = ClientError(
+        {'Error': {'Code': error_code, 'Message': 'Request for i-111 failed'}},
+        'StopInstances'
+    )
+    
+    wrapper = EC2ClientWrapper(region='us-east-1', max_retries=2, base_delay=0.01)
+    with patch('src.ec2_client._shutdown_event.wait', return_value=False):
+        results = wrapper.stop_instances_batch(['i-111', 'i-222', 'i-333'])
+    
+    assert results == {'i-111': False, 'i-222': False, 'i-333': False}
+    # Throttling is retried as a whole request, never per instance
+    expected_calls = 2 if error_code == 'RequestLimitExceeded' else 1
+    assert mock_ec2_instance.stop_instances.call_count == expected_calls
+
+
+def test_stop_instances_batch_empty_list(mock_ec2_client):
+    """Test stop_instances_batch makes no API calls for an empty list."""
+    mock_ec2_instance = mock_ec2_client.return_value
+    
+    wrapper = EC2ClientWrapper(region='us-east-1')
+    results = wrapper.stop_instances_batch([])
+    
+    assert results == {}
+    mock_ec2_instance.stop_instances.assert_not_called()
+
+
 def test_retry_decorator_success_on_first_attempt():
     """Test retry decorator succeeds on first attempt without retries."""
     call_count = 0
@@ -192,14 +753,275 @@ def test_retry_decorator_throttling_error_retries():
             )
         return "success"
     
-    start_time = time.time()
-    result = throttled_operation()
-    elapsed_time = time.time() - start_time
+    with patch('src.ec2_client.random.uniform', side_effect=lambda low, high: high) as mock_uniform, \
+            patch('src.ec2_client._shutdown_event.wait', return_value=False) as mock_wait:
+        result = throttled_operation()
     
     assert result == "success"
     assert call_count == 3
-    # Verify exponential backoff delays: 0.01s + 0.02s = 0.03s minimum
-    assert elapsed_time >= 0.03
+    # Verify exponential backoff upper bounds: 0.01s, then 0.02s
+    assert [c.args for c in mock_uniform.call_args_list] == [(0, 0.01), (0, 0.02)]
+    assert [c.args[0] for c in mock_wait.call_args_list] == [0.01, 0.02]
+
+
+@pytest.mark.parametrize('error_code', [
+    'Throttling',
+    'ThrottlingException',
+    'RequestThrottled',
+    'TooManyRequestsException',
+    'ServiceUnavailable',
+    'RequestTimeout'
+])
+def test_retry_decorator_retries_other_throttling_codes(error_code):
+    """Test retry decorator retries on every throttling and transient error code."""
+    call_count = 0
+    
+    @retry_with_exponential_backoff(max_retries=3, base_delay=0.01)
+    def throttled_operation():
+        nonlocal call_count
+        call_count += 1
+        if call_count < 2:
+            raise ClientError(
+                {'Error': {'Code': error_code, 'Message': 'Rate exceeded'}},
+                'DescribeInstances'
+            )
+        return "success"
+    
+    with patch('src.ec2_client._shutdown_event.wait', return_value=False):
+        result = throttled_operation()
+    
+    assert result == "success"
+    assert call_count == 2
+
+
+@pytest.mark.parametrize('retry_after, expected_delay', [('3', 3.0), ('60', 5.0)])
+def test_retry_decorator_honors_retry_after(retry_after, expected_delay):
+    """Test retry decorator waits for Retry-After, capped at max_delay."""
+    call_count = 0
+    
+    @retry_with_exponential_backoff(max_retries=2, base_delay=0.01, max_delay=5.0)
+    def throttled_operation():
+        nonlocal call_count
+        call_count += 1
+        if call_count < 2:
+            raise ClientError(
+                {
+                    'Error': {'Code': 'ServiceUnavailable', 'Message': 'Try again later'},
+                    'ResponseMetadata': {'HTTPHeaders': {'retry-after': retry_after}}
+                },
+                'StopInstances'
+            )
+        return "success"
+    
+    with patch('src.ec2_client.random.uniform') as mock_uniform, \
+            patch('src.ec2_client._shutdown_event.wait', return_value=False) as mock_wait:
+        result = throttled_operation()
+    
+    assert result == "success"
+    mock_uniform.assert_not_called()
+    mock_wait.assert_called_once_with(expected_delay)
+
+
+def test_retry_decorator_ignores_non_numeric_retry_after():
+    """Test retry decorator falls back to backoff for an HTTP-date Retry-After."""
+    call_count = 0
+    
+    @retry_with_exponential_backoff(max_retries=2, base_delay=0.01, jitter=False)
+    def throttled_operation():
+        nonlocal call_count
+        call_count += 1
+        if call_count < 2:
+            raise ClientError(
+                {
+                    'Error': {'Code': 'Throttling', 'Message': 'Rate exceeded'},
+                    'ResponseMetadata': {
+                        'HTTPHeaders': {'retry-after': 'Wed, 21 Oct 2015 07:28:00 GMT'}
+                    }
+                },
+                'StopInstances'
+            )
+        return "success"
+    
+    with patch('src.ec2_client._shutdown_event.wait', return_value=False) as mock_wait:
+        throttled_operation()
+    
+    mock_wait.assert_called_once_with(0.01)
+
+
+def test_retry_decorator_caps_delay_at_max_delay():
+    """Test retry decorator never draws a delay above max_delay."""
+    call_count = 0
+    
+    @retry_with_exponential_backoff(max_retries=4, base_delay=1.0, max_delay=1.5)
+    def throttled_operation():
+        nonlocal call_count
+        call_count += 1
+        if call_count < 4:
+            raise ClientError(
+                {'Error': {'Code': 'RequestLimitExceeded', 'Message': 'Rate exceeded'}},
+                'DescribeInstances'
+            )
+        return "success"
+    
+    with patch('src.ec2_client.random.uniform', side_effect=lambda low, high: high) as mock_uniform, \
+            patch('src.ec2_client._shutdown_event.wait', return_value=False):
+        result = throttled_operation()
+    
+    assert result == "success"
+    # Uncapped bounds would be 1.0, 2.0, 4.0
+    assert [c.args for c in mock_uniform.call_args_list] == [(0, 1.0), (0, 1.5), (0, 1.5)]
+
+
+def test_retry_decorator_jitter_bounds():
+    """Test jittered delays stay within [0, min(max_delay, base_delay * 2 ** attempt)]."""
+    @retry_with_exponential_backoff(max_retries=5, base_delay=1.0, max_delay=6.0)
+    def always_throttled():
+        raise ClientError(
+            {'Error': {'Code': 'RequestLimitExceeded', 'Message': 'Rate exceeded'}},
+            'DescribeInstances'
+        )
+    
+    delays = []
+    with patch('src.ec2_client.random.uniform', wraps=random.uniform) as mock_uniform, \
+            patch('src.ec2_client._shutdown_event.wait', side_effect=delays.append):
+        for _ in range(50):
+            with pytest.raises(ClientError):
+                always_throttled()
+    
+    # Upper bounds double per attempt and are capped at max_delay
+    bounds = [c.args[1] for c in mock_uniform.call_args_list]
+    assert bounds == [1.0, 2.0, 4.0, 6.0] * 50
+    assert all(0 <= delay <= bound for delay, bound in zip(delays, bounds))
+    assert len(set(delays)) > 1
+
+
+def test_retry_decorator_without_jitter_is_deterministic():
+    """Test retry decorator sleeps for the exact capped backoff when jitter is off."""
+    call_count = 0
+    
+    @retry_with_exponential_backoff(max_retries=4, base_delay=1.0, max_delay=3.0, jitter=False)
+    def throttled_operation():
+        nonlocal call_count
+        call_count += 1
+        if call_count < 4:
+            raise ClientError(
+                {'Error': {'Code': 'RequestLimitExceeded', 'Message': 'Rate exceeded'}},
+                'DescribeInstances'
+            )
+        return "success"
+    
+    with patch('src.ec2_client._shutdown_event.wait', return_value=False) as mock_wait:
+        result = throttled_operation()
+    
+    assert result == "success"
+    assert [c.args[0] for c in mock_wait.call_args_list] == [1.0, 2.0, 3.0]
+
+
+def test_retry_decorator_skips_sleep_for_zero_delay():
+    """Test retry decorator does not sleep when the jittered delay is zero."""
+    call_count = 0
+    
+    @retry_with_exponential_backoff(max_retries=2, base_delay=1.0)
+    def throttled_operation():
+        nonlocal call_count
+        call_count += 1
+        if call_count < 2:
+            raise ClientError(
+                {'Error': {'Code': 'RequestLimitExceeded', 'Message': 'Rate exceeded'}},
+                'DescribeInstances'
+            )
+        return "success"
+    
+    with patch('src.ec2_client.random.uniform', return_value=0), \
+            patch('src.ec2_client._shutdown_event.wait', return_value=False) as mock_wait:
+        result = throttled_operation()
+    
+    assert result == "success"
+    mock_wait.assert_not_called()
+
+
+def test_retry_decorator_aborts_on_shutdown_event():
+    """Test retry decorator stops retrying once shutdown is requested mid-backoff."""
+    call_count = 0
+    
+    @retry_with_exponential_backoff(max_retries=5, base_delay=10.0)
+    def always_throttled():
+        nonlocal call_count
+        call_count += 1
+        # Simulate SIGTERM arriving while the backoff is pending
+        threading.Timer(0.05, _shutdown_event.set).start()
+        raise ClientError(
+            {'Error': {'Code': 'RequestLimitExceeded', 'Message': 'Rate exceeded'}},
+            'DescribeInstances'
+        )
+    
+    start = time.monotonic()
+    try:
+        with patch('src.ec2_client.random.uniform', side_effect=lambda low, high: high):
+            with pytest.raises(ClientError):
+                always_throttled()
+    finally:
+        _shutdown_event.clear()
+    
+    # Raised during the first 10s backoff instead of waiting it out
+    assert call_count == 1
+    assert time.monotonic() - start < 5
+
+
+def test_install_sigterm_handler_sets_shutdown_event():
+    """Test SIGTERM sets the shutdown event and reaches the previous handler."""
+    previous_handler = Mock()
+    original_handler = signal.signal(signal.SIGTERM, previous_handler)
+    try:
+        install_sigterm_handler()
+        signal.raise_signal(signal.SIGTERM)
+        
+        assert _shutdown_event.is_set()
+        previous_handler.assert_called_once()
+    finally:
+        signal.signal(signal.SIGTERM, original_handler)
+        _shutdown_event.clear()
+
+
+def test_install_sigterm_handler_does_not_terminate_process():
+    """Test SIGTERM only sets the shutdown event when no handler was installed before."""
+    original_handler = signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    try:
+        install_sigterm_handler()
+        handle_sigterm = signal.getsignal(signal.SIGTERM)
+        
+        handle_sigterm(signal.SIGTERM, None)
+        
+        assert _shutdown_event.is_set()
+        assert signal.getsignal(signal.SIGTERM) is handle_sigterm
+    finally:
+        signal.signal(signal.SIGTERM, original_handler)
+        _shutdown_event.clear()
+
+
+def test_clear_shutdown_event():
+    """Test clear_shutdown_event forgets an earlier shutdown request."""
+    _shutdown_event.set()
+    
+    clear_shutdown_event()
+    
+    assert not _shutdown_event.is_set()
+
+
+def test_retry_decorator_no_retry_without_error_code():
+    """Test retry decorator does not retry a ClientError whose response has no code."""
+    call_count = 0
+    
+    @retry_with_exponential_backoff(max_retries=3, base_delay=0.01)
+    def malformed_error_operation():
+        nonlocal call_count
+        call_count += 1
+        raise ClientError({}, 'DescribeInstances')
+    
+    with pytest.raises(ClientError):
+        malformed_error_operation()
+    
+    assert call_count == 1
 
 
 def test_retry_decorator_exhausts_retries():
@@ -21,7 +21,7 @@ def mock_ec2_client():
 def test_find_instances_to_stop_running_instances(mock_ec2_client):
     """Test find_instances_to_stop returns only running instances."""
     # Mock EC2 response with running instances
-    mock_ec2_client.describe_instances_by_tag.return_value = [
+    mock_ec2_client.iter_instances_by_tag.return_value = [
         {
             'InstanceId': 'i-111',
             'State': {'Name': 'running'},
@@ -51,12 +51,14 @@ def test_find_instances_to_stop_running_instances(mock_ec2_client):
     assert instances[1].instance_name == 'app-server-01'
     assert instances[1].state == 'running'
     
-    mock_ec2_client.describe_instances_by_tag.assert_called_once_with('AutoShutdown', 'yes')
+    mock_ec2_client.iter_instances_by_tag.assert_called_once_with(
+        'AutoShutdown', 'yes', states=('running',)
+    )
 
 
 def test_find_instances_to_stop_filters_stopped_instances(mock_ec2_client):
     """Test find_instances_to_stop excludes stopped instances."""
-    mock_ec2_client.describe_instances_by_tag.return_value = [
+    mock_ec2_client.iter_instances_by_tag.return_value = [
         {
             'InstanceId': 'i-111',
             'State': {'Name': 'running'},
@@ -79,7 +81,7 @@ def test_find_instances_to_stop_filters_stopped_instances(mock_ec2_client):
 
 def test_find_instances_to_stop_filters_stopping_instances(mock_ec2_client):
     """Test find_instances_to_stop excludes stopping instances."""
-    mock_ec2_client.describe_instances_by_tag.return_value = [
+    mock_ec2_client.iter_instances_by_tag.return_value = [
         {
             'InstanceId': 'i-111',
             'State': {'Name': 'running'},
@@ -101,7 +103,7 @@ def test_find_instances_to_stop_filters_stopping_instances(mock_ec2_client):
 
 def test_find_instances_to_stop_filters_terminated_instances(mock_ec2_client):
     """Test find_instances_to_stop excludes terminated instances."""
-    mock_ec2_client.describe_instances_by_tag.return_value = [
+    mock_ec2_client.iter_instances_by_tag.return_value = [
         {
             'InstanceId': 'i-111',
             'State': {'Name': 'running'},
@@ -123,7 +125,7 @@ def test_find_instances_to_stop_filters_terminated_instances(mock_ec2_client):
 
 def test_find_instances_to_stop_filters_terminating_instances(mock_ec2_client):
     """Test find_instances_to_stop excludes terminating instances."""
-    mock_ec2_client.describe_instances_by_tag.return_value = [
+    mock_ec2_client.iter_instances_by_tag.return_value = [
         {
             'InstanceId': 'i-111',
             'State': {'Name': 'running'},
@@ -145,7 +147,7 @@ def test_find_instances_to_stop_filters_terminating_instances(mock_ec2_client):
 
 def test_find_instances_to_stop_empty_results(mock_ec2_client):
     """Test find_instances_to_stop with no matching instances."""
-    mock_ec2_client.describe_instances_by_tag.return_value = []
+    mock_ec2_client.iter_instances_by_tag.return_value = []
     
     service = InstanceDiscoveryService(mock_ec2_client)
     instances = service.find_instances_to_stop('AutoShutdown', 'yes')
@@ -155,7 +157,7 @@ def test_find_instances_to_stop_empty_results(mock_ec2_client):
 
 def test_find_instances_to_stop_no_name_tag(mock_ec2_client):
     """Test find_instances_to_stop handles instances without Name tag."""
-    mock_ec2_client.describe_instances_by_tag.return_value = [
+    mock_ec2_client.iter_instances_by_tag.return_value = [
         {
             'InstanceId': 'i-111',
             'State': {'Name': 'running'},
@@ -177,7 +179,7 @@ def test_find_instances_to_stop_no_name_tag(mock_ec2_client):
 
 def test_find_instances_to_stop_no_tags(mock_ec2_client):
     """Test find_instances_to_stop handles instances with no tags."""
-    mock_ec2_client.describe_instances_by_tag.return_value = [
+    mock_ec2_client.iter_instances_by_tag.return_value = [
         {
             'InstanceId': 'i-111',
             'State': {'Name': 'running'},
@@ -194,9 +196,63 @@ def test_find_instances_to_stop_no_tags(mock_ec2_client):
     assert instances[0].state == 'running'
 
 
+def test_find_instances_to_stop_name_tag_after_other_tags(mock_ec2_client):
+    """Test find_instances_to_stop finds the Name tag anywhere in the tag list."""
+    mock_ec2_client.iter_instances_by_tag.return_value = [
+        {
+            'InstanceId': 'i-111',
+            'State': {'Name': 'running'},
+            'Tags': [
+                {'Key': 'AutoShutdown', 'Value': 'yes'},
+                {'Key': 'Environment', 'Value': 'production'},
+                {'Key': 'Name', 'Value': 'batch-worker'}
+            ]
+        }
+    ]
+    
+    service = InstanceDiscoveryService(mock_ec2_client)
+    instances = service.find_instances_to_stop('AutoShutdown', 'yes')
+    
+    assert len(instances) == 1
+    assert instances[0].instance_name == 'batch-worker'
+
+
+def test_find_instances_to_stop_missing_tags_key(mock_ec2_client):
+    """Test find_instances_to_stop handles instances without a Tags key."""
+    mock_ec2_client.iter_instances_by_tag.return_value = [
+        {
+            'InstanceId': 'i-111',
+            'State': {'Name': 'running'}
+        }
+    ]
+    
+    service = InstanceDiscoveryService(mock_ec2_client)
+    instances = service.find_instances_to_stop('AutoShutdown', 'yes')
+    
+    assert len(instances) == 1
+    assert instances[0].instance_name == ''
+
+
+def test_find_instances_to_stop_null_tags(mock_ec2_client):
+    """Test find_instances_to_stop handles instances whose Tags value is None."""
+    mock_ec2_client.iter_instances_by_tag.return_value = [
+        {
+            'InstanceId': 'i-111',
+            'State': {'Name': 'running'},
+            'Tags': None
+        }
+    ]
+    
+    service = InstanceDiscoveryService(mock_ec2_client)
+    instances = service.find_instances_to_stop('AutoShutdown', 'yes')
+    
+    assert len(instances) == 1
+    assert instances[0].instance_name == ''
+
+
 def test_find_instances_to_stop_mixed_states(mock_ec2_client):
     """Test find_instances_to_stop with instances in various states."""
-    mock_ec2_client.describe_instances_by_tag.return_value = [
+    mock_ec2_client.iter_instances_by_tag.return_value = [
         {
             'InstanceId': 'i-111',
             'State': {'Name': 'running'},
@@ -235,9 +291,23 @@ def test_find_instances_to_stop_mixed_states(mock_ec2_client):
     assert all(inst.state == 'running' for inst in instances)
 
 
+def test_find_instances_to_stop_shares_state_strings(mock_ec2_client):
+    """Test discovered instances share one canonical state string."""
+    mock_ec2_client.iter_instances_by_tag.return_value = [
+        {'InstanceId': 'i-111', 'State': {'Name': ''.join(['run', 'ning'])}},
+        {'InstanceId': 'i-222', 'State': {'Name': ''.join(['run', 'ning'])}}
+    ]
+    
+    service = InstanceDiscoveryService(mock_ec2_client)
+    instances = service.find_instances_to_stop('AutoShutdown', 'yes')
+    
+    assert [instance.state for instance in instances] == ['running', 'running']
+    assert instances[0].state is instances[1].state
+
+
 def test_find_instances_to_stop_custom_tag(mock_ec2_client):
     """Test find_instances_to_stop with custom tag key and value."""
-    mock_ec2_client.describe_instances_by_tag.return_value = [
+    mock_ec2_client.iter_instances_by_tag.return_value = [
         {
             'InstanceId': 'i-111',
             'State': {'Name': 'running'},
@@ -254,4 +324,24 @@ def test_find_instances_to_stop_custom_tag(mock_ec2_client):
     assert len(instances) == 1
     assert instances[0].instance_id == 'i-111'
     
-    mock_ec2_client.describe_instances_by_tag.assert_called_once_with('Environment', 'dev')
+    mock_ec2_client.iter_instances_by_tag.assert_called_once_with(
+        'Environment', 'dev', states=('running',)
+    )
+
+
+def test_iter_instances_to_stop_is_lazy(mock_ec2_client):
+    """Test iter_instances_to_stop yields InstanceInfo objects as instances stream in."""
+    consumed = []
+    
+    def instance_stream(tag_key, tag_value, states):
+        for instance_id in ('i-111', 'i-222'):
+            consumed.append(instance_id)
+            yield {'InstanceId': instance_id, 'State': {'Name': 'running'}, 'Tags': []}
+    
+    mock_ec2_client.iter_instances_by_tag.side_effect = instance_stream
+    
+    service = InstanceDiscoveryService(mock_ec2_client)
+    instances = service.iter_instances_to_stop('AutoShutdown', 'yes')
+    
+    assert next(instances) == InstanceInfo(instance_id='i-111', instance_name='', state='running')
+    assert consumed == ['i-111']
@@ -6,12 +6,35 @@ integration of all components and correct error handling.
 """
 
 import os
+import signal
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from src.lambda_handler import lambda_handler
+import src.lambda_handler
+from src.ec2_client import _shutdown_event
+from src.lambda_handler import _install_sigterm_handler, lambda_handler
 from src.models import InstanceInfo, ShutdownResult
 
 
+@pytest.fixture(autouse=True)
+def reset_handler_singletons():
+    """
+    Reset cached configuration and logger so each test starts cold.
+    
+    The SIGTERM handler is patched out so handler tests do not replace the
+    test process's own signal handling.
+    """
+    src.lambda_handler._get_configuration.cache_clear()
+    src.lambda_handler._LOGGER = None
+    with patch('src.lambda_handler._install_sigterm_handler'):
+        yield
+    src.lambda_handler._get_configuration.cache_clear()
+    src.lambda_handler._LOGGER = None
+
+
 class TestLambdaHandler:
     """Test suite for lambda_handler function."""
     
@@ -32,10 +55,13 @@ class TestLambdaHandler:
         # Setup mock configuration
         mock_config = Mock()
         mock_config.region = 'us-east-1'
+        mock_config.regions = ('us-east-1',)
         mock_config.tag_key = 'AutoShutdown'
         mock_config.tag_value = 'yes'
         mock_config.max_retries = 3
         mock_config.retry_base_delay = 1.0
+        mock_config.retry_max_delay = 20.0
+        mock_config.log_level = 'INFO'
         mock_config_class.load.return_value = mock_config
         
         # Setup mock logger
@@ -52,7 +78,7 @@ class TestLambdaHandler:
             InstanceInfo(instance_id='i-123', instance_name='test-1', state='running'),
             InstanceInfo(instance_id='i-456', instance_name='test-2', state='running')
         ]
-        mock_discovery.find_instances_to_stop.return_value = mock_instances
+        mock_discovery.iter_instances_to_stop.return_value = iter(mock_instances)
         mock_discovery_class.return_value = mock_discovery
         
         # Setup mock orchestrator
@@ -79,25 +105,35 @@ class TestLambdaHandler:
         # Verify configuration was loaded
         mock_config_class.load.assert_called_once()
         
-        # Verify logger was initialized and used
-        mock_logger_class.assert_called_once()
-        assert mock_logger.info.call_count >= 3  # Start, discovery, summary
+        # Verify logger was initialized with the configured level and used
+        mock_logger_class.assert_called_once_with(level='INFO')
+        mock_logger.info.assert_called_once()  # Start
+        mock_logger.summary.assert_called_once()
+        summary_message, summary = mock_logger.summary.call_args.args
+        assert summary_message == 'EC2 auto-shutdown execution completed'
+        assert summary['instances_found'] == {'us-east-1': 2}
+        assert summary['total_instances'] == 2
+        assert summary['successful_stops'] == 2
+        assert summary['failed_stops'] == 0
         
         # Verify EC2 client was initialized with correct parameters
         mock_ec2_client_class.assert_called_once_with(
             region='us-east-1',
             max_retries=3,
-            base_delay=1.0
+            base_delay=1.0,
+            max_delay=20.0
         )
         
         # Verify discovery service was called
-        mock_discovery.find_instances_to_stop.assert_called_once_with(
+        mock_discovery.iter_instances_to_stop.assert_called_once_with(
             'AutoShutdown',
             'yes'
         )
         
-        # Verify orchestrator was called with discovered instances
-        mock_orchestrator.shutdown_instances.assert_called_once_with(mock_instances)
+        # Verify orchestrator was called with the discovered instances as a stream
+        mock_orchestrator.shutdown_instances.assert_called_once()
+        (streamed_instances,) = mock_orchestrator.shutdown_instances.call_args.args
+        assert list(streamed_instances) == mock_instances
     
     @patch('src.lambda_handler.ShutdownOrchestrator')
     @patch('src.lambda_handler.InstanceDiscoveryService')
@@ -116,10 +152,13 @@ class TestLambdaHandler:
         # Setup mock configuration
         mock_config = Mock()
         mock_config.region = 'us-west-2'
+        mock_config.regions = ('us-west-2',)
         mock_config.tag_key = 'AutoShutdown'
         mock_config.tag_value = 'yes'
         mock_config.max_retries = 3
         mock_config.retry_base_delay = 1.0
+        mock_config.retry_max_delay = 20.0
+        mock_config.log_level = 'INFO'
         mock_config_class.load.return_value = mock_config
         
         # Setup mock logger
@@ -132,7 +171,7 @@ class TestLambdaHandler:
         
         # Setup mock discovery service - no instances found
         mock_discovery = Mock()
-        mock_discovery.find_instances_to_stop.return_value = []
+        mock_discovery.iter_instances_to_stop.return_value = iter(())
         mock_discovery_class.return_value = mock_discovery
         
         # Setup mock orchestrator
@@ -154,10 +193,16 @@ class TestLambdaHandler:
         assert response['body']['result']['total_instances'] == 0
         assert response['body']['result']['successful_stops'] == 0
         
-        # Verify discovery logged zero instances
-        info_calls = [call for call in mock_logger.info.call_args_list]
-        discovery_log = [call for call in info_calls if 'Instance discovery completed' in str(call)]
-        assert len(discovery_log) > 0
+        assert response['body']['message'] == 'No instances to stop'
+        
+        # Verify the orchestrator was skipped entirely
+        mock_orchestrator_class.assert_not_called()
+        mock_orchestrator.shutdown_instances.assert_not_called()
+        
+        # Verify the summary reports zero instances found
+        summary = mock_logger.summary.call_args.args[1]
+        assert summary['instances_found'] == {'us-west-2': 0}
+        assert summary['total_instances'] == 0
     
     @patch('src.lambda_handler.Logger')
     @patch('src.lambda_handler.Configuration')
@@ -202,10 +247,13 @@ class TestLambdaHandler:
         # Setup mock configuration
         mock_config = Mock()
         mock_config.region = 'us-east-1'
+        mock_config.regions = ('us-east-1',)
         mock_config.tag_key = 'AutoShutdown'
         mock_config.tag_value = 'yes'
         mock_config.max_retries = 3
         mock_config.retry_base_delay = 1.0
+        mock_config.retry_max_delay = 20.0
+        mock_config.log_level = 'INFO'
         mock_config_class.load.return_value = mock_config
         
         # Setup mock logger
@@ -218,16 +266,344 @@ class TestLambdaHandler:
         
         # Setup mock discovery service to raise error
         mock_discovery = Mock()
-        mock_discovery.find_instances_to_stop.side_effect = Exception("EC2 API unavailable")
+        mock_discovery.iter_instances_to_stop.side_effect = Exception("EC2 API unavailable")
         mock_discovery_class.return_value = mock_discovery
         
         # Execute lambda handler
         response = lambda_handler({}, None)
         
-        # Verify error response
-        assert response['statusCode'] == 500
-        assert response['body']['message'] == 'Shutdown operation failed'
-        assert 'EC2 API unavailable' in response['body']['error']['message']
+        # Verify the region's error is reported with the (empty) result
+        assert response['statusCode'] == 200
+        assert response['body']['result']['errors'] == [
+            'Processing failed in us-east-1: Exception: EC2 API unavailable'
+        ]
         
-        # Verify error was logged
+        # Verify error was logged with its region and the summary still written
         mock_logger.error.assert_called_once()
+        assert mock_logger.error.call_args.kwargs['region'] == 'us-east-1'
+        mock_logger.summary.assert_called_once()
+    
+    @patch('src.lambda_handler.InstanceDiscoveryService')
+    @patch('src.lambda_handler.EC2ClientWrapper')
+    @patch('src.lambda_handler.Logger')
+    @patch('src.lambda_handler.Configuration')
+    def test_lambda_handler_discovery_fails_after_stops(
+        self,
+        mock_config_class,
+        mock_logger_class,
+        mock_ec2_client_class,
+        mock_discovery_class
+    ):
+        """Test a discovery stream failing partway reports the instances already stopped."""
+        mock_config = Mock()
+        mock_config.region = 'us-east-1'
+        mock_config.regions = ('us-east-1',)
+        mock_config.tag_key = 'AutoShutdown'
+        mock_config.tag_value = 'yes'
+        mock_config.max_retries = 3
+        mock_config.retry_base_delay = 1.0
+        mock_config.retry_max_delay = 20.0
+        mock_config.log_level = 'INFO'
+        mock_config_class.load.return_value = mock_config
+        
+        mock_logger = Mock()
+        mock_logger_class.return_value = mock_logger
+        
+        mock_ec2_client_class.return_value.stop_instances_batch.side_effect = (
+            lambda instance_ids: dict.fromkeys(instance_ids, True)
+        )
+        
+        def iter_instances_to_stop(tag_key, tag_value):
+            yield InstanceInfo(instance_id='i-123', instance_name='', state='running')
+            raise Exception("EC2 API unavailable")
+        
+        mock_discovery_class.return_value.iter_instances_to_stop.side_effect = (
+            iter_instances_to_stop
+        )
+        
+        response = lambda_handler({}, None)
+        
+        expected_errors = ['Instance discovery failed in us-east-1: Exception: EC2 API unavailable']
+        assert response['statusCode'] == 200
+        assert response['body']['result'] == {
+            'total_instances': 1,
+            'successful_stops': 1,
+            'failed_stops': 0,
+            'errors': expected_errors
+        }
+        mock_logger.info.assert_any_call(
+            'Successfully stopped instances', instance_ids=['i-123'], count=1, region='us-east-1'
+        )
+        summary = mock_logger.summary.call_args.args[1]
+        assert summary['successful_stops'] == 1
+        assert summary['errors'] == expected_errors
+    
+    @patch('src.lambda_handler.ShutdownOrchestrator')
+    @patch('src.lambda_handler.InstanceDiscoveryService')
+    @patch('src.lambda_handler.EC2ClientWrapper')
+    @patch('src.lambda_handler.Logger')
+    @patch('src.lambda_handler.Configuration')
+    def test_lambda_handler_reuses_configuration_and_logger(
+        self,
+        mock_config_class,
+        mock_logger_class,
+        mock_ec2_client_class,
+        mock_discovery_class,
+        mock_orchestrator_class
+    ):
+        """Test that warm invocations reuse the loaded configuration and logger."""
+        mock_config = Mock()
+        mock_config.region = 'us-east-1'
+        mock_config.regions = ('us-east-1',)
+        mock_config.tag_key = 'AutoShutdown'
+        mock_config.tag_value = 'yes'
+        mock_config.max_retries = 3
+        mock_config.retry_base_delay = 1.0
+        mock_config.retry_max_delay = 20.0
+        mock_config.log_level = 'INFO'
+        mock_config_class.load.return_value = mock_config
+        
+        mock_discovery_class.return_value.iter_instances_to_stop.return_value = iter(())
+        mock_orchestrator_class.return_value.shutdown_instances.return_value = ShutdownResult(
+            total_instances=0,
+            successful_stops=0,
+            failed_stops=0,
+            errors=[]
+        )
+        
+        first_response = lambda_handler({}, None)
+        second_response = lambda_handler({}, None)
+        
+        assert first_response['statusCode'] == 200
+        assert second_response['statusCode'] == 200
+        mock_config_class.load.assert_called_once()
+        mock_logger_class.assert_called_once()
+    
+    @patch('src.lambda_handler.ShutdownOrchestrator')
+    @patch('src.lambda_handler.InstanceDiscoveryService')
+    @patch('src.lambda_handler.EC2ClientWrapper')
+    @patch('src.lambda_handler.Logger')
+    @patch('src.lambda_handler.Configuration')
+    def test_lambda_handler_retries_failed_configuration_load(
+        self,
+        mock_config_class,
+        mock_logger_class,
+        mock_ec2_client_class,
+        mock_discovery_class,
+        mock_orchestrator_class
+    ):
+        """Test that a failed configuration load is retried on the next invocation."""
+        mock_config = Mock()
+        mock_config.region = 'us-east-1'
+        mock_config.regions = ('us-east-1',)
+        mock_config.tag_key = 'AutoShutdown'
+        mock_config.tag_value = 'yes'
+        mock_config.max_retries = 3
+        mock_config.retry_base_delay = 1.0
+        mock_config.retry_max_delay = 20.0
+        mock_config.log_level = 'INFO'
+        mock_config_class.load.side_effect = iter((
+            ValueError("AWS_REGION environment variable must be set and not empty"),
+            mock_config
+        ))
+        
+        mock_discovery_class.return_value.iter_instances_to_stop.return_value = iter(())
+        mock_orchestrator_class.return_value.shutdown_instances.return_value = ShutdownResult(
+            total_instances=0,
+            successful_stops=0,
+            failed_stops=0,
+            errors=[]
+        )
+        
+        first_response = lambda_handler({}, None)
+        second_response = lambda_handler({}, None)
+        
+        assert first_response['statusCode'] == 500
+        assert second_response['statusCode'] == 200
+        assert mock_config_class.load.call_count == 2
+    
+    @patch('src.lambda_handler.ThreadPoolExecutor', wraps=ThreadPoolExecutor)
+    @patch('src.lambda_handler.ShutdownOrchestrator')
+    @patch('src.lambda_handler.InstanceDiscoveryService')
+    @patch('src.lambda_handler.EC2ClientWrapper')
+    @patch('src.lambda_handler.Logger')
+    @patch('src.lambda_handler.Configuration')
+    def test_lambda_handler_multi_region_parallel(
+        self,
+        mock_config_class,
+        mock_logger_class,
+        mock_ec2_client_class,
+        mock_discovery_class,
+        mock_orchestrator_class,
+        mock_executor_class
+    ):
+        """Test that regions are processed concurrently and results are merged."""
+        mock_config = Mock()
+        mock_config.region = 'us-east-1'
+        mock_config.regions = ('us-east-1', 'eu-west-1')
+        mock_config.tag_key = 'AutoShutdown'
+        mock_config.tag_value = 'yes'
+        mock_config.max_retries = 3
+        mock_config.retry_base_delay = 1.0
+        mock_config.retry_max_delay = 20.0
+        mock_config.log_level = 'INFO'
+        mock_config_class.load.return_value = mock_config
+        
+        # Both regions must be in discovery at the same time to get past the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def iter_instances_to_stop(tag_key, tag_value):
+            barrier.wait()
+            return iter([InstanceInfo(instance_id='i-123', instance_name='', state='running')])
+        
+        mock_discovery_class.return_value.iter_instances_to_stop.side_effect = (
+            iter_instances_to_stop
+        )
+        mock_orchestrator_class.return_value.shutdown_instances.side_effect = iter((
+            ShutdownResult(total_instances=1, successful_stops=1, failed_stops=0, errors=[]),
+            ShutdownResult(
+                total_instances=1,
+                successful_stops=0,
+                failed_stops=1,
+                errors=['Failed to stop instance i-123']
+            )
+        ))
+        
+        response = lambda_handler({}, None)
+        
+        assert response['statusCode'] == 200
+        assert response['body']['result'] == {
+            'total_instances': 2,
+            'successful_stops': 1,
+            'failed_stops': 1,
+            'errors': ['Failed to stop instance i-123']
+        }
+        mock_executor_class.assert_called_once_with(max_workers=2)
+        assert [
+            call.kwargs['region'] for call in mock_ec2_client_class.call_args_list
+        ] == ['us-east-1', 'eu-west-1']
+
+
+@patch('src.lambda_handler.ShutdownOrchestrator')
+@patch('src.lambda_handler.InstanceDiscoveryService')
+@patch('src.lambda_handler.EC2ClientWrapper')
+@patch('src.lambda_handler.Logger')
+@patch('src.lambda_handler.Configuration')
+def test_lambda_handler_failing_region_keeps_other_results(
+    mock_config_class,
+    mock_logger_class,
+    mock_ec2_client_class,
+    mock_discovery_class,
+    mock_orchestrator_class
+):
+    """Test one failing region is reported without discarding the other regions' results."""
+    mock_config = Mock()
+    mock_config.region = 'us-east-1'
+    mock_config.regions = ('us-east-1', 'ap-east-1')
+    mock_config.tag_key = 'AutoShutdown'
+    mock_config.tag_value = 'yes'
+    mock_config.max_retries = 3
+    mock_config.retry_base_delay = 1.0
+    mock_config.retry_max_delay = 20.0
+    mock_config.log_level = 'INFO'
+    mock_config_class.load.return_value = mock_config
+    mock_logger = mock_logger_class.return_value
+    
+    def create_discovery(ec2_client):
+        discovery = Mock()
+        if ec2_client.region == 'ap-east-1':
+            discovery.iter_instances_to_stop.side_effect = Exception("AuthFailure")
+        else:
+            discovery.iter_instances_to_stop.return_value = iter([
+                InstanceInfo(instance_id='i-123', instance_name='', state='running')
+            ])
+        return discovery
+    
+    mock_ec2_client_class.side_effect = lambda region, **kwargs: Mock(region=region)
+    mock_discovery_class.side_effect = create_discovery
+    mock_orchestrator_class.return_value.shutdown_instances.return_value = ShutdownResult(
+        total_instances=1, successful_stops=1, failed_stops=0, errors=[]
+    )
+    
+    response = lambda_handler({}, None)
+    
+    assert response['statusCode'] == 200
+    assert response['body']['result'] == {
+        'total_instances': 1,
+        'successful_stops': 1,
+        'failed_stops': 0,
+        'errors': ['Processing failed in ap-east-1: Exception: AuthFailure']
+    }
+    summary = mock_logger.summary.call_args.args[1]
+    assert summary['instances_found'] == {'us-east-1': 1, 'ap-east-1': 0}
+    assert mock_orchestrator_class.call_args.kwargs['region'] == 'us-east-1'
+
+
+@patch('src.lambda_handler.InstanceDiscoveryService')
+@patch('src.lambda_handler.EC2ClientWrapper')
+@patch('src.lambda_handler.Logger')
+@patch('src.lambda_handler.Configuration')
+def test_lambda_handler_clears_earlier_shutdown_request(
+    mock_config_class,
+    mock_logger_class,
+    mock_ec2_client_class,
+    mock_discovery_class
+):
+    """Test a SIGTERM seen by an earlier invocation does not disable retries in the next one."""
+    mock_config = Mock()
+    mock_config.region = 'us-east-1'
+    mock_config.regions = ('us-east-1',)
+    mock_config.log_level = 'INFO'
+    mock_config_class.load.return_value = mock_config
+    mock_discovery_class.return_value.iter_instances_to_stop.return_value = iter(())
+    _shutdown_event.set()
+    
+    try:
+        lambda_handler({}, None)
+        
+        assert not _shutdown_event.is_set()
+    finally:
+        _shutdown_event.clear()
+
+
+def test_lambda_handler_import_defers_boto3():
+    """Test importing the handler module does not import boto3 until it is needed."""
+    code = (
+        "import sys\n"
+        "import src.lambda_handler as handler\n"
+        "assert 'boto3' not in sys.modules\n"
+        "from src.ec2_client import EC2ClientWrapper\n"
+        "assert handler.EC2ClientWrapper is EC2ClientWrapper\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True
+    )
+    
+    assert completed.returncode == 0, completed.stderr
+
+
+def test_lambda_handler_unknown_attribute_raises():
+    """Test the lazy loader only resolves known names."""
+    with pytest.raises(AttributeError):
+        src.lambda_handler.NotARealName
+
+
+def test_install_sigterm_handler_installs_once():
+    """Test the SIGTERM handler is installed on first use only and restore the previous one."""
+    original_handler = signal.getsignal(signal.SIGTERM)
+    src.lambda_handler._SIGTERM_HANDLER_INSTALLED = False
+    try:
+        _install_sigterm_handler()
+        installed_handler = signal.getsignal(signal.SIGTERM)
+        _install_sigterm_handler()
+        
+        assert installed_handler is not original_handler
+        assert installed_handler.__name__ == 'handle_sigterm'
+        assert signal.getsignal(signal.SIGTERM) is installed_handler
+        assert src.lambda_handler._SIGTERM_HANDLER_INSTALLED
+    finally:
+        signal.signal(signal.SIGTERM, original_handler)
+        src.lambda_handler._SIGTERM_HANDLER_INSTALLED = False
@@ -5,137 +5,253 @@ Tests the structured logging functionality including JSON formatting,
 log levels, and additional structured fields.
 """
 
-import json
-import logging
-from io import StringIO
-from unittest.mock import patch
+import re
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
 
 import pytest
 
+# Log lines are decoded with orjson when it is installed, as it parses faster
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+import src.logger as logger_module
 from src.logger import Logger
 
+# Extracts the timestamp value from a log line without decoding the whole entry
+_TS_RE = re.compile(r'"timestamp"\s*:\s*"([^"]+Z)"')
+
+
+@pytest.fixture
+def patched_logger_method():
+    """
+    Replace methods of a Logger's underlying logging.Logger with Mocks.
+    
+    The Mock is assigned directly as an instance attribute, which shadows the
+    class method without the setup cost of patch.object; deleting it on
+    teardown restores the original method.
+    """
+    swapped = []
+    
+    def swap(logger, name):
+        mock = Mock()
+        setattr(logger._logger, name, mock)
+        swapped.append((logger._logger, name))
+        return mock
+    
+    yield swap
+    
+    for target, name in swapped:
+        delattr(target, name)
+
+
+@pytest.fixture(scope="module")
+def logger():
+    """
+    Logger shared by the tests in this module that use the default settings.
+    
+    Tests that need another level create their own Logger under a different
+    name, since Loggers with the same name share one logging.Logger.
+    """
+    return Logger()
+
 
 class TestLogger:
     """Test suite for Logger class"""
     
-    def test_info_logs_with_correct_level(self):
-        """Test that info() logs with INFO level"""
-        logger = Logger()
+    @pytest.mark.parametrize("method, level", [
+        ("info", "INFO"),
+        ("warning", "WARNING"),
+        ("error", "ERROR")
+    ])
+    def test_logs_with_correct_level(self, logger, patched_logger_method, method, level):
+        """Test that info(), warning() and error() log with their level"""
+        mock_method = patched_logger_method(logger, method)
         
-        with patch.object(logger._logger, 'info') as mock_info:
-            logger.info("Test message")
-            
-            # Verify info was called
-            assert mock_info.called
-            
-            # Parse the JSON log message
-            log_json = json.loads(mock_info.call_args[0][0])
-            assert log_json["level"] == "INFO"
-            assert log_json["message"] == "Test message"
-    
-    def test_warning_logs_with_correct_level(self):
-        """Test that warning() logs with WARNING level"""
-        logger = Logger()
+        getattr(logger, method)("Test message")
         
-        with patch.object(logger._logger, 'warning') as mock_warning:
-            logger.warning("Test warning")
-            
-            # Verify warning was called
-            assert mock_warning.called
-            
-            # Parse the JSON log message
-            log_json = json.loads(mock_warning.call_args[0][0])
-            assert log_json["level"] == "WARNING"
-            assert log_json["message"] == "Test warning"
-    
-    def test_error_logs_with_correct_level(self):
-        """Test that error() logs with ERROR level"""
-        logger = Logger()
+        # Verify the matching logging method was called
+        assert mock_method.called
         
-        with patch.object(logger._logger, 'error') as mock_error:
-            logger.error("Test error")
-            
-            # Verify error was called
-            assert mock_error.called
-            
-            # Parse the JSON log message
-            log_json = json.loads(mock_error.call_args[0][0])
-            assert log_json["level"] == "ERROR"
-            assert log_json["message"] == "Test error"
+        # Parse the JSON log message
+        log_json = _json.loads(mock_method.call_args[0][0])
+        assert log_json["level"] == level
+        assert log_json["message"] == "Test message"
     
-    def test_log_includes_timestamp(self):
+    def test_log_includes_timestamp(self, logger, patched_logger_method):
         """Test that all logs include ISO 8601 timestamp"""
-        logger = Logger()
+        mock_info = patched_logger_method(logger, 'info')
         
-        with patch.object(logger._logger, 'info') as mock_info:
-            logger.info("Test message")
-            
-            log_json = json.loads(mock_info.call_args[0][0])
-            assert "timestamp" in log_json
-            # Verify it ends with 'Z' for UTC
-            assert log_json["timestamp"].endswith("Z")
-            # Verify it contains ISO format elements
-            assert "T" in log_json["timestamp"]
-    
-    def test_log_includes_structured_fields(self):
+        logger.info("Test message")
+        
+        # The pattern only matches a timestamp ending with 'Z' for UTC
+        match = _TS_RE.search(mock_info.call_args[0][0])
+        assert match
+        # Verify it contains ISO format elements
+        assert "T" in match.group(1)
+    
+    def test_log_includes_structured_fields(self, logger, patched_logger_method):
         """Test that additional kwargs are included as structured fields"""
-        logger = Logger()
+        mock_info = patched_logger_method(logger, 'info')
         
-        with patch.object(logger._logger, 'info') as mock_info:
-            logger.info("Instance stopped", instance_id="i-123", state="stopped")
-            
-            log_json = json.loads(mock_info.call_args[0][0])
-            assert log_json["instance_id"] == "i-123"
-            assert log_json["state"] == "stopped"
+        logger.info("Instance stopped", instance_id="i-123", state="stopped")
+        
+        log_json = _json.loads(mock_info.call_args[0][0])
+        assert log_json["instance_id"] == "i-123"
+        assert log_json["state"] == "stopped"
     
-    def test_log_with_multiple_structured_fields(self):
+    def test_log_with_multiple_structured_fields(self, logger, patched_logger_method):
         """Test logging with multiple structured fields"""
-        logger = Logger()
-        
-        with patch.object(logger._logger, 'error') as mock_error:
-            logger.error(
-                "Failed to stop instance",
-                instance_id="i-abc123",
-                error_type="InsufficientInstanceCapacity",
-                error_message="Not enough capacity",
-                region="us-east-1"
-            )
-            
-            log_json = json.loads(mock_error.call_args[0][0])
-            assert log_json["level"] == "ERROR"
-            assert log_json["message"] == "Failed to stop instance"
-            assert log_json["instance_id"] == "i-abc123"
-            assert log_json["error_type"] == "InsufficientInstanceCapacity"
-            assert log_json["error_message"] == "Not enough capacity"
-            assert log_json["region"] == "us-east-1"
-    
-    def test_log_output_is_valid_json(self):
+        mock_error = patched_logger_method(logger, 'error')
+        
+        logger.error(
+            "Failed to stop instance",
+            instance_id="i-abc123",
+            error_type="InsufficientInstanceCapacity",
+            error_message="Not enough capacity",
+            region="us-east-1"
+        )
+        
+        log_json = _json.loads(mock_error.call_args[0][0])
+        expected = {
+            "level": "ERROR",
+            "message": "Failed to stop instance",
+            "instance_id": "i-abc123",
+            "error_type": "InsufficientInstanceCapacity",
+            "error_message": "Not enough capacity",
+            "region": "us-east-1"
+        }
+        assert expected.items() <= log_json.items()
+    
+    def test_log_output_is_valid_json(self, logger, patched_logger_method):
         """Test that log output is valid JSON that can be parsed"""
-        logger = Logger()
+        mock_info = patched_logger_method(logger, 'info')
         
-        with patch.object(logger._logger, 'info') as mock_info:
-            logger.info("Test", key1="value1", key2=123, key3=True)
-            
-            # Should not raise exception
-            log_json = json.loads(mock_info.call_args[0][0])
-            
-            # Verify all fields are present
-            assert log_json["message"] == "Test"
-            assert log_json["key1"] == "value1"
-            assert log_json["key2"] == 123
-            assert log_json["key3"] is True
+        logger.info("Test", key1="value1", key2=123, key3=True)
+        
+        # Should not raise exception
+        log_json = _json.loads(mock_info.call_args[0][0])
+        
+        # Verify all fields are present
+        assert log_json["message"] == "Test"
+        assert log_json["key1"] == "value1"
+        assert log_json["key2"] == 123
+        assert log_json["key3"] is True
     
-    def test_log_without_structured_fields(self):
+    def test_log_without_structured_fields(self, logger, patched_logger_method):
         """Test logging with only message, no additional fields"""
-        logger = Logger()
+        mock_info = patched_logger_method(logger, 'info')
+        
+        logger.info("Simple message")
+        
+        log_json = _json.loads(mock_info.call_args[0][0])
+        # Should only have timestamp, level, and message
+        assert log_json.keys() == {"timestamp", "level", "message"}
+        assert log_json["level"] == "INFO"
+        assert log_json["message"] == "Simple message"
+    
+    def test_log_output_is_compact(self, logger, patched_logger_method):
+        """Test that log output has no whitespace between JSON tokens"""
+        mock_info = patched_logger_method(logger, 'info')
+        
+        logger.info("Test", key="value")
+        
+        log_line = mock_info.call_args[0][0]
+        assert '": ' not in log_line
+        assert ', "' not in log_line
+    
+    def test_timestamp_has_fixed_precision(self, logger, patched_logger_method):
+        """Test that timestamps always carry milliseconds, even when zero"""
+        epoch = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc).timestamp()
         
-        with patch.object(logger._logger, 'info') as mock_info:
-            logger.info("Simple message")
+        mock_info = patched_logger_method(logger, 'info')
+        
+        with patch('src.logger._time', side_effect=iter((epoch, epoch + 0.25, epoch + 1.5))):
+            logger.info("First")
+            logger.info("Same second")
+            logger.info("Next second")
+        
+        timestamps = [_json.loads(c[0][0])["timestamp"] for c in mock_info.call_args_list]
+        assert timestamps == [
+            "2024-01-01T12:00:00.000Z",
+            "2024-01-01T12:00:00.250Z",
+            "2024-01-01T12:00:01.500Z"
+        ]
+    
+    def test_messages_below_level_are_not_formatted(self, patched_logger_method):
+        """Test that suppressed levels skip JSON formatting entirely"""
+        logger = Logger(name="ec2-auto-shutdown-warning", level="WARNING")
+        
+        mock_info = patched_logger_method(logger, 'info')
+        
+        with patch.object(logger, '_format_log') as mock_format:
+            logger.info("Suppressed message")
             
-            log_json = json.loads(mock_info.call_args[0][0])
-            # Should only have timestamp, level, and message
-            assert "timestamp" in log_json
-            assert log_json["level"] == "INFO"
-            assert log_json["message"] == "Simple message"
-            # Should not have extra keys beyond these three
-            assert len(log_json) == 3
+            mock_format.assert_not_called()
+            mock_info.assert_not_called()
+    
+    def test_messages_at_level_are_logged(self, patched_logger_method):
+        """Test that messages at or above the configured level are emitted"""
+        logger = Logger(name="ec2-auto-shutdown-warning", level="WARNING")
+        
+        mock_warning = patched_logger_method(logger, 'warning')
+        mock_error = patched_logger_method(logger, 'error')
+        
+        logger.warning("Warning message")
+        logger.error("Error message")
+        
+        assert _json.loads(mock_warning.call_args[0][0])["level"] == "WARNING"
+        assert _json.loads(mock_error.call_args[0][0])["level"] == "ERROR"
+    
+    def test_log_line_written_to_stdout(self, logger, capsys):
+        """Test that each log entry is written to stdout as a single JSON line"""
+        logger.info("Instance stopped", instance_id="i-123")
+        
+        captured = capsys.readouterr()
+        lines = captured.out.splitlines()
+        assert len(lines) == 1
+        log_json = _json.loads(lines[0])
+        assert log_json["message"] == "Instance stopped"
+        assert log_json["instance_id"] == "i-123"
+        assert captured.err == ""
+    
+    def test_summary_logs_single_nested_record(self, logger, patched_logger_method):
+        """Test that summary() emits one INFO entry with the event nested"""
+        event = {"instances_found": {"us-east-1": 2}, "failed_stops": 0}
+        
+        mock_info = patched_logger_method(logger, 'info')
+        
+        logger.summary("Execution completed", event)
+        
+        mock_info.assert_called_once()
+        log_json = _json.loads(mock_info.call_args[0][0])
+        assert log_json["level"] == "INFO"
+        assert log_json["message"] == "Execution completed"
+        assert log_json["summary"] == event
+    
+    def test_summary_respects_log_level(self, patched_logger_method):
+        """Test that summary() is suppressed when INFO is below the level"""
+        logger = Logger(name="ec2-auto-shutdown-warning", level="WARNING")
+        
+        mock_info = patched_logger_method(logger, 'info')
+        
+        logger.summary("Execution completed", {"total_instances": 1})
+        
+        mock_info.assert_not_called()
+    
+    def test_stdlib_and_orjson_encoders_match(self):
+        """Test that the optional orjson encoder produces the same output as json"""
+        pytest.importorskip("orjson")
+        log_entry = {
+            "timestamp": "2024-01-01T12:00:00.000Z",
+            "level": "INFO",
+            "message": "Instance stopped",
+            "instance_ids": ["i-123", "i-456"],
+            "instance_name": "café-ü-東京",
+            "count": 2,
+            "dry_run": False
+        }
+        
+        assert logger_module._dumps_orjson(log_entry) == logger_module._dumps_stdlib(log_entry)
@@ -2,10 +2,20 @@
 Unit tests for data models
 """
 
+import dataclasses
+
 import pytest
 from src.models import InstanceInfo, ShutdownResult
 
 
+# Error messages shared by the multiple-errors test
+_ERRORS = (
+    "Failed to stop i-111: PermissionDenied",
+    "Failed to stop i-222: InstanceNotFound",
+    "Failed to stop i-333: InternalError"
+)
+
+
 def test_instance_info_creation():
     """Test that InstanceInfo can be created with all fields"""
     instance = InstanceInfo(
@@ -14,9 +24,11 @@ def test_instance_info_creation():
         state="running"
     )
     
-    assert instance.instance_id == "i-1234567890abcdef0"
-    assert instance.instance_name == "web-server-01"
-    assert instance.state == "running"
+    assert dataclasses.asdict(instance) == {
+        "instance_id": "i-1234567890abcdef0",
+        "instance_name": "web-server-01",
+        "state": "running"
+    }
 
 
 def test_instance_info_empty_name():
@@ -27,22 +39,50 @@ def test_instance_info_empty_name():
         state="stopped"
     )
     
-    assert instance.instance_id == "i-abcdef1234567890"
-    assert instance.instance_name == ""
-    assert instance.state == "stopped"
+    assert dataclasses.asdict(instance) == {
+        "instance_id": "i-abcdef1234567890",
+        "instance_name": "",
+        "state": "stopped"
+    }
 
 
-def test_instance_info_various_states():
+@pytest.mark.parametrize(
+    "state",
+    ["running", "stopped", "stopping", "terminated", "terminating", "pending"]
+)
+def test_instance_info_various_states(state):
     """Test that InstanceInfo can represent various instance states"""
-    states = ["running", "stopped", "stopping", "terminated", "terminating", "pending"]
+    instance = InstanceInfo(
+        instance_id=f"i-{state}",
+        instance_name=f"instance-{state}",
+        state=state
+    )
+    assert instance.state == state
+
+
+
+def test_instance_info_is_immutable():
+    """Test that InstanceInfo fields cannot be reassigned"""
+    instance = InstanceInfo(
+        instance_id="i-1234567890abcdef0",
+        instance_name="web-server-01",
+        state="running"
+    )
+    
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        instance.state = "stopped"
+
+
+def test_instance_info_uses_slots():
+    """Test that InstanceInfo has no per-instance __dict__"""
+    instance = InstanceInfo(
+        instance_id="i-1234567890abcdef0",
+        instance_name="web-server-01",
+        state="running"
+    )
     
-    for state in states:
-        instance = InstanceInfo(
-            instance_id=f"i-{state}",
-            instance_name=f"instance-{state}",
-            state=state
-        )
-        assert instance.state == state
+    assert not hasattr(instance, "__dict__")
+    assert hash(instance) == hash(InstanceInfo("i-1234567890abcdef0", "web-server-01", "running"))
 
 
 
@@ -55,11 +95,12 @@ def test_shutdown_result_creation():
         errors=["Failed to stop i-abc123: InsufficientInstanceCapacity"]
     )
     
-    assert result.total_instances == 5
-    assert result.successful_stops == 4
-    assert result.failed_stops == 1
-    assert len(result.errors) == 1
-    assert result.errors[0] == "Failed to stop i-abc123: InsufficientInstanceCapacity"
+    assert dataclasses.asdict(result) == {
+        "total_instances": 5,
+        "successful_stops": 4,
+        "failed_stops": 1,
+        "errors": ["Failed to stop i-abc123: InsufficientInstanceCapacity"]
+    }
 
 
 def test_shutdown_result_no_errors():
@@ -71,28 +112,40 @@ def test_shutdown_result_no_errors():
         errors=[]
     )
     
-    assert result.total_instances == 3
-    assert result.successful_stops == 3
-    assert result.failed_stops == 0
-    assert result.errors == []
+    assert dataclasses.asdict(result) == {
+        "total_instances": 3,
+        "successful_stops": 3,
+        "failed_stops": 0,
+        "errors": []
+    }
 
 
 def test_shutdown_result_multiple_errors():
     """Test that ShutdownResult can handle multiple error messages"""
-    errors = [
-        "Failed to stop i-111: PermissionDenied",
-        "Failed to stop i-222: InstanceNotFound",
-        "Failed to stop i-333: InternalError"
-    ]
     result = ShutdownResult(
         total_instances=5,
         successful_stops=2,
         failed_stops=3,
-        errors=errors
+        errors=list(_ERRORS)
+    )
+    
+    assert dataclasses.asdict(result) == {
+        "total_instances": 5,
+        "successful_stops": 2,
+        "failed_stops": 3,
+        "errors": list(_ERRORS)
+    }
+
+
+def test_shutdown_result_is_immutable_and_slotted():
+    """Test that ShutdownResult fields cannot be reassigned and it has no __dict__"""
+    result = ShutdownResult(
+        total_instances=1,
+        successful_stops=1,
+        failed_stops=0,
+        errors=[]
     )
     
-    assert result.total_instances == 5
-    assert result.successful_stops == 2
-    assert result.failed_stops == 3
-    assert len(result.errors) == 3
-    assert result.errors == errors
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.failed_stops = 1
+    assert not hasattr(result, "__dict__")
@@ -0,0 +1,69 @@
+"""
+Unit tests for TokenBucket
+
+Tests that the token bucket allows bursts up to its capacity and paces
+further calls to its refill rate.
+"""
+
+import threading
+import time
+import pytest
+from src.rate_limiter import TokenBucket
+
+
+def test_rate_limiter_allows_burst_up_to_capacity():
+    """Test calls within the bucket capacity do not wait."""
+    bucket = TokenBucket(rate=1.0, capacity=5.0)
+    
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    
+    assert time.monotonic() - start < 0.5
+
+
+def test_rate_limiter_paces_calls():
+    """Test N back-to-back calls beyond the burst take at least N / rate seconds."""
+    bucket = TokenBucket(rate=50.0, capacity=1.0)
+    bucket.acquire()  # Drain the initial burst
+    
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    
+    assert time.monotonic() - start >= 5 / 50.0 * 0.9
+
+
+def test_rate_limiter_paces_concurrent_callers():
+    """Test callers on several threads share one rate."""
+    bucket = TokenBucket(rate=50.0, capacity=1.0)
+    bucket.acquire()  # Drain the initial burst
+    
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert time.monotonic() - start >= 5 / 50.0 * 0.9
+
+
+def test_rate_limiter_wait_ends_when_cancel_event_is_set():
+    """Test a pacing wait returns early once the cancel event is set."""
+    bucket = TokenBucket(rate=0.1, capacity=1.0)
+    bucket.acquire()  # Drain the initial burst
+    cancel_event = threading.Event()
+    cancel_event.set()
+    
+    start = time.monotonic()
+    bucket.acquire(cancel_event)
+    
+    assert time.monotonic() - start < 1.0
+
+
+@pytest.mark.parametrize('rate, capacity', [(0, 1.0), (1.0, 0), (-1.0, 1.0)])
+def test_rate_limiter_rejects_non_positive_settings(rate, capacity):
+    """Test rate and capacity must be positive."""
+    with pytest.raises(ValueError, match="rate and capacity must be positive"):
+        TokenBucket(rate=rate, capacity=capacity)
@@ -0,0 +1,42 @@
+"""
+Benchmarks for ShutdownOrchestrator
+
+Measures shutdown_instances throughput on a large synthetic instance list so
+regressions in the per-instance bookkeeping show up as timing changes.
+Skipped when pytest-benchmark is not installed.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from src.ec2_client import EC2ClientWrapper
+from src.logger import Logger
+from src.shutdown_orchestrator import ShutdownOrchestrator
+from src.models import InstanceInfo
+
+pytest.importorskip("pytest_benchmark")
+
+
+INSTANCE_COUNT = 10000
+
+
+def test_shutdown_10k_instances(benchmark):
+    """Benchmark stopping 10,000 instances with a no-op EC2 client"""
+    # Arrange
+    ec2_client = MagicMock(spec=EC2ClientWrapper)
+    ec2_client.stop_instances_batch.side_effect = (
+        lambda instance_ids: dict.fromkeys(instance_ids, True)
+    )
+    logger = MagicMock(spec=Logger)
+    orchestrator = ShutdownOrchestrator(ec2_client, logger)
+    
+    instances = [
+        InstanceInfo(instance_id=f"i-{n}", instance_name="", state="running")
+        for n in range(INSTANCE_COUNT)
+    ]
+    
+    # Act
+    result = benchmark(orchestrator.shutdown_instances, instances)
+    
+    # Assert
+    assert result.successful_stops == INSTANCE_COUNT
+    assert result.failed_stops == 0
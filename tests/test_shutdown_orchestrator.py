@@ -6,38 +6,61 @@ statistics collection, and logging behavior.
 """
 
 import pytest
-from unittest.mock import Mock, MagicMock
-from src.shutdown_orchestrator import ShutdownOrchestrator
+from unittest.mock import MagicMock
+from src.ec2_client import EC2ClientWrapper, MAX_STOP_BATCH_SIZE
+from src.logger import Logger
+from src.shutdown_orchestrator import ShutdownOrchestrator, SUCCESS_LOG_CHUNK_SIZE
 from src.models import InstanceInfo, ShutdownResult
 
 
+# Orchestrator for tests that make no stop calls; mocks are reset before use
+_SHARED_CLIENT = MagicMock(spec=EC2ClientWrapper)
+_SHARED_LOGGER = MagicMock(spec=Logger)
+_SHARED_ORCH = ShutdownOrchestrator(_SHARED_CLIENT, _SHARED_LOGGER)
+
+
+@pytest.fixture(scope="module")
+def three_running_instances():
+    """Three running instances shared by the multi-instance tests (InstanceInfo is immutable)"""
+    return [
+        InstanceInfo(instance_id="i-111", instance_name="web-1", state="running"),
+        InstanceInfo(instance_id="i-222", instance_name="web-2", state="running"),
+        InstanceInfo(instance_id="i-333", instance_name="web-3", state="running")
+    ]
+
+
+@pytest.fixture
+def orch():
+    """Orchestrator wired to fresh spec'd EC2 client and logger mocks"""
+    ec2_client = MagicMock(spec=EC2ClientWrapper)
+    logger = MagicMock(spec=Logger)
+    return ShutdownOrchestrator(ec2_client, logger), ec2_client, logger
+
+
 class TestShutdownOrchestrator:
     """Test suite for ShutdownOrchestrator class"""
     
     def test_shutdown_empty_list(self):
         """Test shutdown with empty instance list"""
         # Arrange
-        ec2_client = Mock()
-        logger = Mock()
-        orchestrator = ShutdownOrchestrator(ec2_client, logger)
+        _SHARED_CLIENT.reset_mock()
+        _SHARED_LOGGER.reset_mock()
         
         # Act
-        result = orchestrator.shutdown_instances([])
+        result = _SHARED_ORCH.shutdown_instances([])
         
         # Assert
         assert result.total_instances == 0
         assert result.successful_stops == 0
         assert result.failed_stops == 0
         assert result.errors == []
-        ec2_client.stop_instance.assert_not_called()
+        _SHARED_CLIENT.stop_instances_batch.assert_not_called()
     
-    def test_shutdown_single_instance_success(self):
+    def test_shutdown_single_instance_success(self, orch):
         """Test successful shutdown of single instance"""
         # Arrange
-        ec2_client = Mock()
-        ec2_client.stop_instance.return_value = True
-        logger = Mock()
-        orchestrator = ShutdownOrchestrator(ec2_client, logger)
+        orchestrator, ec2_client, logger = orch
+        ec2_client.stop_instances_batch.return_value = {"i-123": True}
         
         instances = [
             InstanceInfo(instance_id="i-123", instance_name="web-server", state="running")
@@ -51,17 +74,15 @@ class TestShutdownOrchestrator:
         assert result.successful_stops == 1
         assert result.failed_stops == 0
         assert result.errors == []
-        ec2_client.stop_instance.assert_called_once_with("i-123")
+        ec2_client.stop_instances_batch.assert_called_once_with(["i-123"])
         logger.info.assert_called_once()
         logger.error.assert_not_called()
     
-    def test_shutdown_single_instance_failure(self):
+    def test_shutdown_single_instance_failure(self, orch):
         """Test failed shutdown of single instance"""
         # Arrange
-        ec2_client = Mock()
-        ec2_client.stop_instance.return_value = False
-        logger = Mock()
-        orchestrator = ShutdownOrchestrator(ec2_client, logger)
+        orchestrator, ec2_client, logger = orch
+        ec2_client.stop_instances_batch.return_value = {"i-456": False}
         
         instances = [
             InstanceInfo(instance_id="i-456", instance_name="db-server", state="running")
@@ -75,83 +96,75 @@ class TestShutdownOrchestrator:
         assert result.successful_stops == 0
         assert result.failed_stops == 1
         assert len(result.errors) == 1
-        assert "i-456" in result.errors[0]
-        assert "db-server" in result.errors[0]
-        ec2_client.stop_instance.assert_called_once_with("i-456")
+        assert result.errors[0] == "Failed to stop instance i-456 (db-server)"
+        ec2_client.stop_instances_batch.assert_called_once_with(["i-456"])
         logger.info.assert_not_called()
         logger.error.assert_called_once()
     
-    def test_shutdown_multiple_instances_all_success(self):
+    def test_shutdown_multiple_instances_all_success(self, orch, three_running_instances):
         """Test successful shutdown of multiple instances"""
         # Arrange
-        ec2_client = Mock()
-        ec2_client.stop_instance.return_value = True
-        logger = Mock()
-        orchestrator = ShutdownOrchestrator(ec2_client, logger)
-        
-        instances = [
-            InstanceInfo(instance_id="i-111", instance_name="web-1", state="running"),
-            InstanceInfo(instance_id="i-222", instance_name="web-2", state="running"),
-            InstanceInfo(instance_id="i-333", instance_name="web-3", state="running")
-        ]
+        orchestrator, ec2_client, logger = orch
+        ec2_client.stop_instances_batch.return_value = {
+            "i-111": True,
+            "i-222": True,
+            "i-333": True
+        }
         
         # Act
-        result = orchestrator.shutdown_instances(instances)
+        result = orchestrator.shutdown_instances(three_running_instances)
         
         # Assert
         assert result.total_instances == 3
         assert result.successful_stops == 3
         assert result.failed_stops == 0
         assert result.errors == []
-        assert ec2_client.stop_instance.call_count == 3
-        assert logger.info.call_count == 3
+        ec2_client.stop_instances_batch.assert_called_once_with(["i-111", "i-222", "i-333"])
+        # Successes are aggregated into a single log entry
+        logger.info.assert_called_once()
+        assert logger.info.call_args[1]["instance_ids"] == ["i-111", "i-222", "i-333"]
         logger.error.assert_not_called()
     
-    def test_shutdown_multiple_instances_mixed_results(self):
+    def test_shutdown_multiple_instances_mixed_results(self, orch, three_running_instances):
         """Test shutdown with some successes and some failures"""
         # Arrange
-        ec2_client = Mock()
-        # First call succeeds, second fails, third succeeds
-        ec2_client.stop_instance.side_effect = [True, False, True]
-        logger = Mock()
-        orchestrator = ShutdownOrchestrator(ec2_client, logger)
-        
-        instances = [
-            InstanceInfo(instance_id="i-aaa", instance_name="server-1", state="running"),
-            InstanceInfo(instance_id="i-bbb", instance_name="server-2", state="running"),
-            InstanceInfo(instance_id="i-ccc", instance_name="server-3", state="running")
-        ]
+        orchestrator, ec2_client, logger = orch
+        # First stop succeeds, second fails, third succeeds
+        ec2_client.stop_instances_batch.return_value = {
+            "i-111": True,
+            "i-222": False,
+            "i-333": True
+        }
         
         # Act
-        result = orchestrator.shutdown_instances(instances)
+        result = orchestrator.shutdown_instances(three_running_instances)
         
         # Assert
         assert result.total_instances == 3
         assert result.successful_stops == 2
         assert result.failed_stops == 1
         assert len(result.errors) == 1
-        assert "i-bbb" in result.errors[0]
-        assert ec2_client.stop_instance.call_count == 3
-        assert logger.info.call_count == 2
-        assert logger.error.call_count == 1
+        assert result.errors[0] == "Failed to stop instance i-222 (web-2)"
+        assert (
+            ec2_client.stop_instances_batch.call_count,
+            logger.info.call_count,
+            logger.error.call_count
+        ) == (1, 1, 1)
+        assert logger.info.call_args[1]["instance_ids"] == ["i-111", "i-333"]
     
-    def test_shutdown_continues_after_failure(self):
+    def test_shutdown_continues_after_failure(self, orch, three_running_instances):
         """Test that processing continues even when individual stops fail"""
         # Arrange
-        ec2_client = Mock()
+        orchestrator, ec2_client, logger = orch
         # First two fail, third succeeds
-        ec2_client.stop_instance.side_effect = [False, False, True]
-        logger = Mock()
-        orchestrator = ShutdownOrchestrator(ec2_client, logger)
-        
-        instances = [
-            InstanceInfo(instance_id="i-fail1", instance_name="fail-1", state="running"),
-            InstanceInfo(instance_id="i-fail2", instance_name="fail-2", state="running"),
-            InstanceInfo(instance_id="i-success", instance_name="success", state="running")
-        ]
+        ec2_client.stop_instances_batch.return_value = {
+            "i-111": False,
+            "i-222": False,
+            "i-333": True
+        }
         
         # Act
-        result = orchestrator.shutdown_instances(instances)
+        result = orchestrator.shutdown_instances(three_running_instances)
         
         # Assert
         assert result.total_instances == 3
@@ -159,15 +172,13 @@ class TestShutdownOrchestrator:
         assert result.failed_stops == 2
         assert len(result.errors) == 2
         # Verify all three instances were attempted
-        assert ec2_client.stop_instance.call_count == 3
+        ec2_client.stop_instances_batch.assert_called_once_with(["i-111", "i-222", "i-333"])
     
-    def test_shutdown_logs_instance_details(self):
+    def test_shutdown_logs_instance_details(self, orch):
         """Test that instance details are logged correctly"""
         # Arrange
-        ec2_client = Mock()
-        ec2_client.stop_instance.return_value = True
-        logger = Mock()
-        orchestrator = ShutdownOrchestrator(ec2_client, logger)
+        orchestrator, ec2_client, logger = orch
+        ec2_client.stop_instances_batch.return_value = {"i-xyz": True}
         
         instances = [
             InstanceInfo(instance_id="i-xyz", instance_name="test-server", state="running")
@@ -179,17 +190,16 @@ class TestShutdownOrchestrator:
         # Assert
         logger.info.assert_called_once()
         call_args = logger.info.call_args
-        assert "Successfully stopped instance" in call_args[0][0]
-        assert call_args[1]["instance_id"] == "i-xyz"
-        assert call_args[1]["instance_name"] == "test-server"
+        kw = call_args.kwargs
+        assert "Successfully stopped instances" in call_args.args[0]
+        assert kw["instance_ids"] == ["i-xyz"]
+        assert kw["count"] == 1
     
-    def test_shutdown_instance_without_name(self):
+    def test_shutdown_instance_without_name(self, orch):
         """Test shutdown of instance without a name tag"""
         # Arrange
-        ec2_client = Mock()
-        ec2_client.stop_instance.return_value = True
-        logger = Mock()
-        orchestrator = ShutdownOrchestrator(ec2_client, logger)
+        orchestrator, ec2_client, logger = orch
+        ec2_client.stop_instances_batch.return_value = {"i-noname": True}
         
         instances = [
             InstanceInfo(instance_id="i-noname", instance_name="", state="running")
@@ -201,6 +211,129 @@ class TestShutdownOrchestrator:
         # Assert
         assert result.successful_stops == 1
         logger.info.assert_called_once()
-        call_args = logger.info.call_args
-        assert call_args[1]["instance_id"] == "i-noname"
-        assert call_args[1]["instance_name"] == ""
+        kw = logger.info.call_args.kwargs
+        assert kw["instance_ids"] == ["i-noname"]
+    
+    def test_shutdown_missing_batch_result_counts_as_failure(self, orch):
+        """Test that an instance absent from the batch results is reported as failed"""
+        # Arrange
+        orchestrator, ec2_client, logger = orch
+        ec2_client.stop_instances_batch.return_value = {"i-111": True}
+        
+        instances = [
+            InstanceInfo(instance_id="i-111", instance_name="web-1", state="running"),
+            InstanceInfo(instance_id="i-222", instance_name="web-2", state="running")
+        ]
+        
+        # Act
+        result = orchestrator.shutdown_instances(instances)
+        
+        # Assert
+        assert result.successful_stops == 1
+        assert result.failed_stops == 1
+        assert result.errors[0] == "Failed to stop instance i-222 (web-2)"
+    
+    def test_shutdown_chunks_success_log_entries(self, orch):
+        """Test that large success lists are split across several log entries"""
+        # Arrange
+        orchestrator, ec2_client, logger = orch
+        instance_count = SUCCESS_LOG_CHUNK_SIZE + 1
+        instances = [
+            InstanceInfo(instance_id=f"i-{n}", instance_name="", state="running")
+            for n in range(instance_count)
+        ]
+        ec2_client.stop_instances_batch.return_value = {
+            instance.instance_id: True for instance in instances
+        }
+        
+        # Act
+        result = orchestrator.shutdown_instances(instances)
+        
+        # Assert
+        assert result.successful_stops == instance_count
+        assert logger.info.call_count == 2
+        first_call, second_call = logger.info.call_args_list
+        assert first_call[1]["count"] == SUCCESS_LOG_CHUNK_SIZE
+        assert second_call[1]["instance_ids"] == [f"i-{SUCCESS_LOG_CHUNK_SIZE}"]
+    
+    def test_shutdown_streams_instances_in_batches(self, orch):
+        """Test that a generator of instances is stopped batch by batch as it is consumed"""
+        # Arrange
+        orchestrator, ec2_client, logger = orch
+        instance_count = MAX_STOP_BATCH_SIZE + 1
+        produced = []
+        
+        def instance_stream():
+            for n in range(instance_count):
+                produced.append(n)
+                yield InstanceInfo(instance_id=f"i-{n}", instance_name="", state="running")
+        
+        batch_sizes_seen = []
+        
+        def stop_instances_batch(instance_ids):
+            # Record how much of the stream had been consumed at each call
+            batch_sizes_seen.append((len(instance_ids), len(produced)))
+            return {instance_id: True for instance_id in instance_ids}
+        
+        ec2_client.stop_instances_batch.side_effect = stop_instances_batch
+        
+        # Act
+        result = orchestrator.shutdown_instances(instance_stream())
+        
+        # Assert
+        assert result.total_instances == instance_count
+        assert result.successful_stops == instance_count
+        # The first batch is stopped before the rest of the stream is produced
+        assert batch_sizes_seen == [
+            (MAX_STOP_BATCH_SIZE, MAX_STOP_BATCH_SIZE),
+            (1, instance_count)
+        ]
+    
+    def test_shutdown_reports_batches_stopped_before_stream_fails(self, orch):
+        """Test that a stream failing partway keeps and logs the batches already stopped"""
+        # Arrange
+        orchestrator, ec2_client, logger = orch
+        
+        def instance_stream():
+            for n in range(MAX_STOP_BATCH_SIZE):
+                yield InstanceInfo(instance_id=f"i-{n}", instance_name="", state="running")
+            raise RuntimeError("describe failed")
+        
+        ec2_client.stop_instances_batch.side_effect = (
+            lambda instance_ids: dict.fromkeys(instance_ids, True)
+        )
+        
+        # Act
+        result = orchestrator.shutdown_instances(instance_stream())
+        
+        # Assert
+        assert result.total_instances == MAX_STOP_BATCH_SIZE
+        assert result.successful_stops == MAX_STOP_BATCH_SIZE
+        assert result.failed_stops == 0
+        assert result.errors == ["Instance discovery failed: RuntimeError: describe failed"]
+        ec2_client.stop_instances_batch.assert_called_once()
+        assert sum(call.kwargs["count"] for call in logger.info.call_args_list) == MAX_STOP_BATCH_SIZE
+        logger.error.assert_called_once()
+        assert logger.error.call_args.args[0] == "Instance discovery failed"
+        assert logger.error.call_args.kwargs["instances_processed"] == MAX_STOP_BATCH_SIZE
+    
+    def test_shutdown_includes_region_in_logs_and_errors(self):
+        """Test that a region given to the orchestrator tags its log entries and errors"""
+        # Arrange
+        ec2_client = MagicMock(spec=EC2ClientWrapper)
+        ec2_client.stop_instances_batch.return_value = {"i-111": True, "i-222": False}
+        logger = MagicMock(spec=Logger)
+        orchestrator = ShutdownOrchestrator(ec2_client, logger, region="eu-west-1")
+        
+        instances = [
+            InstanceInfo(instance_id="i-111", instance_name="web-1", state="running"),
+            InstanceInfo(instance_id="i-222", instance_name="web-2", state="running")
+        ]
+        
+        # Act
+        result = orchestrator.shutdown_instances(instances)
+        
+        # Assert
+        assert result.errors == ["Failed to stop instance i-222 (web-2) in eu-west-1"]
+        assert logger.info.call_args.kwargs["region"] == "eu-west-1"
+        assert logger.error.call_args.kwargs["region"] == "eu-west-1"